@@ -0,0 +1,19 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_avatar'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+        ),
+    ]
@@ -28,6 +28,9 @@ class User(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [models.Index(fields=["date_joined"], name="user_date_joined_idx")]
+
     def __unicode__(self):
         return self.email
     
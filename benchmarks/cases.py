@@ -0,0 +1,133 @@
+"""
+The hot paths timed by ``manage.py benchmark``.
+
+Each case is a factory that receives the Fixtures of a seeded database,
+does any per-case setup once, and returns the callable to time. Views are
+called directly, bypassing the middleware and the page cache, so the
+timings cover the ORM and template work only. Lazy querysets left in a
+context are evaluated so their queries are part of the timing. Async views
+are driven with async_to_sync, as a WSGI worker would run them.
+"""
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import QuerySet
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import reverse
+
+from accounts.models import User
+from campaign.models import Campaign
+from campaign.views import (
+    DONATION_ORDERING,
+    CampaignDetailView,
+    CampaignListView,
+    LoadMoreDonationsView,
+)
+from core.pagination import cursor_values, encode_cursor
+from dashboard.views.admin_views import AdminDashboardView
+from dashboard.views.common_views import DashboardView
+
+from .seed import ADMIN_EMAIL
+
+CASES = {}
+
+
+def case(name):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+
+    return register
+
+
+class Fixtures:
+    """The requests and rows every case works with."""
+
+    def __init__(self):
+        self.factory = RequestFactory()
+        self.admin = User.objects.get(email=ADMIN_EMAIL)
+        # The most donated-to campaign has the longest donation feed.
+        self.campaign = Campaign.objects.order_by("-donor_count").first()
+        self.owner = self.campaign.user
+
+    def request(self, path, user=None, **params):
+        request = self.factory.get(path, params)
+        request.user = user or AnonymousUser()
+        return request
+
+
+def evaluate(context):
+    for value in context.values():
+        if isinstance(value, QuerySet):
+            list(value)
+    return context
+
+
+@case("campaign_list")
+def campaign_list(fixtures):
+    view = CampaignListView.as_view()
+    path = reverse("campaign:campaign-list")
+    return lambda: view(fixtures.request(path)).render()
+
+
+@case("campaign_list_search")
+def campaign_list_search(fixtures):
+    view = CampaignListView.as_view()
+    path = reverse("campaign:campaign-list")
+    return lambda: view(fixtures.request(path, q="music community")).render()
+
+
+@case("campaign_card")
+def campaign_card(fixtures):
+    campaign = Campaign.objects.with_stats().select_related("user").get(pk=fixtures.campaign.pk)
+    return lambda: render_to_string("includes/campaign.html", {"campaign": campaign})
+
+
+@case("campaign_detail_context")
+def campaign_detail_context(fixtures):
+    path = reverse("campaign:campaign-detail", args=[fixtures.campaign.pk])
+
+    async def run():
+        view = CampaignDetailView()
+        view.setup(fixtures.request(path), pk=fixtures.campaign.pk)
+        campaign = await Campaign.objects.aget(pk=fixtures.campaign.pk)
+        return await view.get_context_data(campaign)
+
+    return async_to_sync(run)
+
+
+@case("admin_dashboard")
+def admin_dashboard(fixtures):
+    view = AdminDashboardView.as_view()
+    path = reverse("admin_dashboard:home")
+    return lambda: view(fixtures.request(path, fixtures.admin))
+
+
+@case("dashboard_context")
+def dashboard_context(fixtures):
+    path = reverse("dashboard:home")
+
+    def run():
+        view = DashboardView()
+        view.setup(fixtures.request(path, fixtures.owner))
+        return evaluate(view.get_context_data())
+
+    return run
+
+
+@case("load_more")
+def load_more(fixtures):
+    view = async_to_sync(LoadMoreDonationsView.as_view())
+    path = reverse("campaign:load-more-donations", args=[fixtures.campaign.pk])
+    return lambda: view(fixtures.request(path), pk=fixtures.campaign.pk)
+
+
+@case("load_more_deep")
+def load_more_deep(fixtures):
+    """A page from the middle of the feed, reached by cursor."""
+    view = async_to_sync(LoadMoreDonationsView.as_view())
+    path = reverse("campaign:load-more-donations", args=[fixtures.campaign.pk])
+    donations = fixtures.campaign.donation_set.filter(approved=True).order_by(*DONATION_ORDERING)
+    middle = donations[donations.count() // 2]
+    cursor = encode_cursor(cursor_values(middle, DONATION_ORDERING))
+    return lambda: view(fixtures.request(path, cursor=cursor), pk=fixtures.campaign.pk)
@@ -0,0 +1,322 @@
+"""
+End-to-end load test: the app under gunicorn, hammered over HTTP.
+
+``manage.py loadtest`` starts gunicorn on localhost against a copy of a
+seeded benchmark database. It then runs ``concurrency`` client threads,
+each replaying a weighted mix of endpoints, and reports latency
+percentiles, throughput and error rates per endpoint. Server errors caused
+by SQLite lock contention are found by parsing the tracebacks the workers
+log to stderr. They are reported separately, since they are the errors
+that worker counts and write patterns affect.
+"""
+import http.cookiejar
+import os
+import random
+import re
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+import requests
+from django.conf import settings
+from django.urls import reverse
+
+from accounts.models import User
+from campaign.models import Campaign
+from core.models import Category
+
+from .seed import ADMIN_EMAIL, PASSWORD
+
+# name: (default weight, pattern of the request path for log attribution)
+ENDPOINTS = {
+    "home": (25, r"^/$"),
+    "search": (15, r"^/campaign/campaigns/$"),
+    "detail": (25, r"^/campaign/details/"),
+    "load_more": (15, r"/donations/load-more$"),
+    "donate": (5, r"/donation$"),
+    "owner_dashboard": (10, r"^/dashboard/$"),
+    "admin_dashboard": (5, r"^/admin/$"),
+}
+
+LOCKED = "database is locked"
+
+# interface: (application, default gunicorn worker class)
+INTERFACES = {
+    "asgi": ("qonty.asgi:application", "uvicorn.workers.UvicornWorker"),
+    "wsgi": ("qonty.wsgi:application", "sync"),
+}
+
+
+def parse_mix(text):
+    """Parse ``"home=30,detail=20"`` into weights; unnamed endpoints keep their default."""
+    mix = {name: weight for name, (weight, _) in ENDPOINTS.items()}
+    for part in filter(None, (text or "").split(",")):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("The traffic mix has no weight")
+    return mix
+
+
+def classify(path):
+    for name, (_, pattern) in ENDPOINTS.items():
+        if re.search(pattern, path):
+            return name
+    return None
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ErrorLog:
+    """Counts the logged server errors caused by SQLite lock contention, per endpoint."""
+
+    def __init__(self):
+        self.locked = Counter()
+        self.counting = False
+        self.endpoint = None
+
+    def feed(self, line):
+        failed = re.search(r"Internal Server Error: (\S+)", line)
+        if failed:
+            self.endpoint = classify(failed[1])
+        elif LOCKED in line and self.endpoint is not None:
+            if self.counting:
+                self.locked[self.endpoint] += 1
+            self.endpoint = None
+
+
+class Server:
+    """gunicorn serving the app from ``database``, with its error log parsed."""
+
+    def __init__(self, database, workers, threads, worker_class=None, interface="asgi"):
+        application, default_worker_class = INTERFACES[interface]
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.errors = ErrorLog()
+        env = {
+            **os.environ,
+            "SQLITE_PATH": database,
+            "DEBUG": "false",
+            "DEBUG_TOOLBAR": "false",
+            "SESSION_COOKIE_SECURE": "false",
+            "METRICS_DIR": "",
+            # Pages only; no collected static files to read a manifest from
+            "STATIC_MANIFEST": "false",
+        }
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", application,
+                "--bind", f"127.0.0.1:{self.port}",
+                "--workers", str(workers),
+                "--threads", str(threads),
+                "--worker-class", worker_class or default_worker_class,
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        self.reader = threading.Thread(target=self.read_log, daemon=True)
+        self.reader.start()
+
+    def read_log(self):
+        for line in self.process.stderr:
+            self.errors.feed(line)
+
+    def wait_until_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                requests.get(self.url + "/about/", timeout=5)
+                return
+            except requests.RequestException:
+                time.sleep(0.2)
+        raise RuntimeError(f"gunicorn did not answer within {timeout}s")
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.reader.join(5)
+
+
+class Traffic:
+    """Builds the requests of each endpoint from rows of the seeded database."""
+
+    def __init__(self, base_url, owners=20):
+        self.base_url = base_url
+        self.campaigns = list(
+            Campaign.objects.order_by("-donor_count").values_list("pk", flat=True)[:500]
+        )
+        self.terms = [name.lower() for name in Category.objects.values_list("name", flat=True)]
+        self.terms += ["project", "community", "music project"]
+        emails = User.objects.filter(campaign__isnull=False, is_superuser=False).order_by("pk")
+        emails = list(emails.values_list("email", flat=True).distinct()[:owners])
+        self.owner_sessions = [self.login(email) for email in emails]
+        self.admin_session = self.login(ADMIN_EMAIL)
+
+    def login(self, email):
+        response = requests.post(
+            self.base_url + reverse("accounts:login"),
+            data={"email": email, "password": PASSWORD},
+            allow_redirects=False,
+            timeout=30,
+        )
+        session = response.cookies.get(settings.SESSION_COOKIE_NAME)
+        if response.status_code != 302 or not session:
+            raise RuntimeError(f"Could not log in as {email}")
+        return {settings.SESSION_COOKIE_NAME: session}
+
+    def build(self, name, rng):
+        """Return ``(method, path, data, cookies, success statuses)``."""
+        campaign = rng.choice(self.campaigns)
+        if name == "home":
+            return "GET", reverse("core:home"), None, None, (200,)
+        if name == "search":
+            path = reverse("campaign:campaign-list")
+            return "GET", path, {"q": rng.choice(self.terms)}, None, (200,)
+        if name == "detail":
+            return "GET", reverse("campaign:campaign-detail", args=[campaign]), None, None, (200,)
+        if name == "load_more":
+            return "GET", reverse("campaign:load-more-donations", args=[campaign]), None, None, (200,)
+        if name == "donate":
+            data = {
+                "fullname": "Load Test",
+                "email": f"load{rng.randrange(10_000)}@benchmark.local",
+                "country": "India",
+                "postal_code": "110001",
+                "donation": rng.randint(5, 500),
+                "comment": "",
+                "idempotency_key": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            }
+            return "POST", reverse("campaign:campaign-donation", args=[campaign]), data, None, (302,)
+        if name == "owner_dashboard":
+            return "GET", reverse("dashboard:home"), None, rng.choice(self.owner_sessions), (200,)
+        if name == "admin_dashboard":
+            return "GET", reverse("admin_dashboard:home"), None, self.admin_session, (200,)
+        raise ValueError(name)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+
+    def report(self, elapsed, locked):
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "database_locked": locked,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        }
+
+
+def run_load(server, traffic, mix, concurrency, duration, warmup, seed, log=lambda message: None):
+    """
+    Replay ``mix`` from ``concurrency`` threads for ``warmup`` + ``duration``
+    seconds; only requests started after the warmup are recorded.
+    """
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    stats = {name: EndpointStats() for name in names}
+    lock = threading.Lock()
+    start = time.monotonic()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def client(number):
+        rng = random.Random(f"{seed}:{number}")
+        session = requests.Session()
+        # Every request carries exactly the cookies its endpoint asks for.
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        while True:
+            began = time.monotonic()
+            if began >= stop_at:
+                return
+            name = rng.choices(names, weights)[0]
+            method, path, data, cookies, ok = traffic.build(name, rng)
+            try:
+                response = session.request(
+                    method, server.url + path,
+                    params=data if method == "GET" else None,
+                    data=data if method == "POST" else None,
+                    cookies=cookies, allow_redirects=False, timeout=60,
+                )
+                status = response.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.monotonic() - began
+            if began < measure_from:
+                continue
+            with lock:
+                endpoint = stats[name]
+                endpoint.latencies.append(elapsed)
+                endpoint.statuses[status] += 1
+                if status not in ok:
+                    endpoint.errors += 1
+
+    threads = [threading.Thread(target=client, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    if warmup:
+        log(f"Warming up for {warmup}s...")
+        time.sleep(warmup)
+    server.errors.counting = True
+    log(f"Measuring for {duration}s with {concurrency} clients...")
+    for thread in threads:
+        thread.join()
+    server.errors.counting = False
+    elapsed = time.monotonic() - measure_from
+
+    results = {name: endpoint.report(elapsed, server.errors.locked[name]) for name, endpoint in stats.items()}
+    total = EndpointStats()
+    for endpoint in stats.values():
+        total.latencies += endpoint.latencies
+        total.statuses.update(endpoint.statuses)
+        total.errors += endpoint.errors
+    results["total"] = total.report(elapsed, sum(server.errors.locked.values()))
+    return results
+
+
+def working_copy(path):
+    """Copy the seeded database so writes made by a run never leak into the next."""
+    copy = f"{path}.loadtest"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(copy + suffix):
+            os.remove(copy + suffix)
+    shutil.copyfile(path, copy)
+    return copy
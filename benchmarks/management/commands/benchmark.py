@@ -0,0 +1,76 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.cases import CASES
+from benchmarks.runner import compare, environment, run_benchmarks
+from benchmarks.seed import SCALES, default_path, prepare_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a dedicated benchmark database and time the ORM and template hot paths. '
+        'The project database is never touched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='1k',
+                            help='Named size of the seeded database (campaigns)')
+        parser.add_argument('--campaigns', type=int, help='Number of campaigns (overrides --scale)')
+        parser.add_argument('--donations', type=int, help='Number of donations (overrides --scale)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated rows')
+        parser.add_argument('--db', help='SQLite file to seed or reuse (default: one per size in the temp dir)')
+        parser.add_argument('--reseed', action='store_true', help='Rebuild the database even if it exists')
+        parser.add_argument('--case', action='append', choices=sorted(CASES), dest='cases',
+                            help='Case to run; repeat for several (default: all)')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed runs per case')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per case')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Keep caches between runs instead of timing cold renders')
+        parser.add_argument('--output', help='JSON results file (default: benchmark-<commit>-<size>.json)')
+        parser.add_argument('--compare', help='Earlier results file to compare the medians against')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+
+        campaigns, donations = SCALES[options['scale']]
+        campaigns = options['campaigns'] or campaigns
+        donations = options['donations'] if options['donations'] is not None else donations
+        size = f"{campaigns}c-{donations}d-s{options['seed']}"
+        path = options['db'] or default_path(campaigns, donations, options['seed'])
+        try:
+            prepare_database(
+                path, campaigns, donations, options['seed'], options['reseed'], log=self.stdout.write
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+        # Time what production runs: no query logging.
+        settings.DEBUG = False
+
+        results = run_benchmarks(
+            options['cases'], options['warmup'], options['repeat'],
+            options['warm_cache'], log=self.stdout.write,
+        )
+        meta = environment()
+        meta.update(
+            campaigns=campaigns, donations=donations, seed=options['seed'],
+            warmup=options['warmup'], repeat=options['repeat'], warm_cache=options['warm_cache'],
+        )
+        report = {'meta': meta, 'results': results}
+
+        output = options['output'] or f"benchmark-{(meta['commit'] or 'unknown')[:10]}-{size}.json"
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {e}")
+            for name, before, after, change in compare(baseline, report):
+                self.stdout.write(f'{name:<28} {before:>10.3f} ms -> {after:>10.3f} ms  {change:+7.1f}%')
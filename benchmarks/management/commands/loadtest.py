@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.loadtest import ENDPOINTS, INTERFACES, Server, Traffic, parse_mix, run_load, working_copy
+from benchmarks.seed import SCALES, default_path, prepare_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the app under gunicorn against a seeded database and replay a weighted '
+        'traffic mix, reporting latency percentiles, throughput and errors per endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='1k',
+                            help='Named size of the seeded database (campaigns)')
+        parser.add_argument('--campaigns', type=int, help='Number of campaigns (overrides --scale)')
+        parser.add_argument('--donations', type=int, help='Number of donations (overrides --scale)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the data and the traffic')
+        parser.add_argument('--db', help='Seeded SQLite file to copy (default: the benchmark one for the size)')
+        parser.add_argument('--reseed', action='store_true', help='Rebuild the seeded database')
+        parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent clients')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to measure')
+        parser.add_argument('--warmup', type=float, default=5, help='Seconds of unrecorded traffic first')
+        parser.add_argument('--mix', help=(
+            'Endpoint weights, e.g. "donate=20,home=10" (endpoints: %s)' % ', '.join(ENDPOINTS)
+        ))
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+        parser.add_argument('--threads', type=int, default=1, help='gunicorn threads per worker')
+        parser.add_argument('--interface', choices=INTERFACES, default='asgi',
+                            help='Serve the ASGI application, as production does, or the WSGI one')
+        parser.add_argument('--worker-class',
+                            help='gunicorn worker class (default: uvicorn for ASGI, sync for WSGI)')
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(e)
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency and --duration must be positive')
+
+        campaigns, donations = SCALES[options['scale']]
+        campaigns = options['campaigns'] or campaigns
+        donations = options['donations'] if options['donations'] is not None else donations
+        path = options['db'] or default_path(campaigns, donations, options['seed'])
+        try:
+            prepare_database(
+                path, campaigns, donations, options['seed'], options['reseed'], log=self.stdout.write
+            )
+        except ValueError as e:
+            raise CommandError(e)
+        # The server writes to a copy, so every run starts from the same data.
+        database = working_copy(path)
+
+        server = Server(
+            database, options['workers'], options['threads'],
+            options['worker_class'], options['interface'],
+        )
+        try:
+            server.wait_until_ready()
+            traffic = Traffic(server.url)
+            results = run_load(
+                server, traffic, mix, options['concurrency'], options['duration'],
+                options['warmup'], options['seed'], log=self.stdout.write,
+            )
+        except RuntimeError as e:
+            raise CommandError(e)
+        finally:
+            server.stop()
+
+        self.stdout.write(
+            f"{'endpoint':<16} {'reqs':>7} {'rps':>8} {'err%':>6} {'locked':>6} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<16} {row['requests']:>7} {row['throughput_rps']:>8} "
+                f"{row['error_rate'] * 100:>6.1f} {row['database_locked']:>6} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}"
+            )
+
+        if options['output']:
+            report = {
+                'config': {
+                    key: options[key] for key in (
+                        'concurrency', 'duration', 'warmup', 'workers', 'threads',
+                        'interface', 'worker_class', 'seed',
+                    )
+                } | {'campaigns': campaigns, 'donations': donations, 'mix': mix},
+                'results': results,
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
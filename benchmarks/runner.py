@@ -0,0 +1,99 @@
+"""
+Times benchmark cases and reads and writes the JSON result files.
+"""
+import datetime
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import ExitStack
+
+import django
+from django.core.cache import cache
+from django.db import connection, connections
+
+from core.metrics import QueryTimer
+
+from .cases import CASES, Fixtures
+
+
+def time_case(run, warmup, repeat, warm_cache=False):
+    """
+    Call ``run`` ``warmup`` times untimed, then ``repeat`` times timed.
+
+    The cache is cleared before every call unless ``warm_cache`` is set, so
+    by default the timings are for cold fragment and query caches.
+    """
+    for _ in range(warmup):
+        if not warm_cache:
+            cache.clear()
+        run()
+
+    timings = []
+    queries = []
+    for _ in range(repeat):
+        if not warm_cache:
+            cache.clear()
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timer))
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        queries.append(timer.queries)
+
+    timings.sort()
+    ms = [t * 1000 for t in timings]
+    return {
+        "runs": repeat,
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "max_ms": round(ms[-1], 3),
+        "stdev_ms": round(statistics.stdev(ms), 3) if len(ms) > 1 else 0.0,
+        "queries": max(queries),
+    }
+
+
+def run_benchmarks(names=None, warmup=3, repeat=20, warm_cache=False, log=lambda message: None):
+    fixtures = Fixtures()
+    results = {}
+    for name in names or CASES:
+        run = CASES[name](fixtures)
+        results[name] = time_case(run, warmup, repeat, warm_cache)
+        log(f"{name}: median {results[name]['median_ms']} ms, {results[name]['queries']} queries")
+    return results
+
+
+def environment():
+    """Where and on what code the results were measured."""
+
+    def git(*args):
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "machine": platform.machine(),
+    }
+
+
+def compare(old, new):
+    """Yield ``(case, old median, new median, change in percent)`` for shared cases."""
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+        yield name, before["median_ms"], result["median_ms"], change
@@ -0,0 +1,207 @@
+"""
+Deterministic bulk seeding of a benchmark database.
+
+The same ``campaigns``, ``donations`` and ``seed`` produce the same rows on
+a given day: primary keys and every random choice come from the seeded
+generator, and dates are laid out over the year up to today's midnight, so
+dashboards and deadlines see current activity. Rows are inserted with
+bulk_create, then the denormalized campaign totals, daily rollups, platform stats and search index are rebuilt from the
+tables with the repair commands, so the seeded database matches one grown
+through the app. Donations are skewed towards a few popular campaigns, as
+real traffic is.
+"""
+import io
+import os
+import random
+import tempfile
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from accounts.models import User
+from campaign.models import Campaign, CampaignStatusChoices, Donation, gravatar_hash
+from campaign.search import index_campaigns
+from core.models import Category, Country
+
+# Named scales: (campaigns, donations)
+SCALES = {
+    "1k": (1_000, 20_000),
+    "10k": (10_000, 200_000),
+    "100k": (100_000, 1_000_000),
+}
+
+PASSWORD = "benchmark"
+ADMIN_EMAIL = "admin@benchmark.local"
+CATEGORIES = (
+    "Technology", "Arts", "Film", "Music", "Games",
+    "Publishing", "Food", "Design", "Fashion", "Education",
+)
+STATUSES = (
+    (CampaignStatusChoices.APPROVED, 50),
+    (CampaignStatusChoices.ACTIVE, 20),
+    (CampaignStatusChoices.PENDING, 20),
+    (CampaignStatusChoices.COMPLETED, 10),
+)
+
+
+def owner_email(i):
+    return f"owner{i}@benchmark.local"
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def seed_database(campaigns, donations, seed=0, chunk_size=10_000, log=lambda message: None):
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    # Midnight rather than the current time, so reseeding later the same day
+    # gives the same rows.
+    now = timezone.make_aware(datetime.combine(today, time.min))
+    password = make_password(PASSWORD, salt=f"benchmark{seed}")
+
+    categories = Category.objects.bulk_create(
+        Category(name=name, slug=name.lower()) for name in CATEGORIES
+    )
+    Country.objects.bulk_create(
+        Country(code=code, name=name)
+        for code, name in (("IN", "India"), ("US", "United States"), ("GB", "United Kingdom"))
+    )
+
+    owner_count = max(10, campaigns // 10)
+    log(f"Creating {owner_count} owners...")
+    owners = [
+        User(
+            username=f"owner{i}",
+            email=owner_email(i),
+            password=password,
+            date_joined=now - timedelta(minutes=rng.randrange(525_600)),
+        )
+        for i in range(owner_count)
+    ]
+    owners.append(User(
+        username="admin", email=ADMIN_EMAIL, password=password,
+        is_staff=True, is_superuser=True, date_joined=now,
+    ))
+    for chunk in _chunks(owners, chunk_size):
+        User.objects.bulk_create(chunk)
+    owners = list(User.objects.filter(is_superuser=False).order_by("id"))
+
+    log(f"Creating {campaigns} campaigns...")
+    statuses, weights = zip(*STATUSES)
+    rows = []
+    for i in range(campaigns):
+        category = rng.choice(categories)
+        status = rng.choices(statuses, weights)[0]
+        rows.append(Campaign(
+            id=_uuid(rng),
+            title=f"{category.name} project {i}",
+            description=f"Help fund {category.name.lower()} project number {i} in our community.",
+            user=rng.choice(owners),
+            category=category,
+            date=now - timedelta(minutes=rng.randrange(525_600)),
+            status=status,
+            is_active=status == CampaignStatusChoices.ACTIVE,
+            image="campaigns/benchmark.jpg",
+            goal=rng.randrange(5_000, 150_000, 500),
+            location="Benchmark City",
+            deadline=today + timedelta(days=rng.randint(-30, 180)),
+        ))
+    for chunk in _chunks(rows, chunk_size):
+        Campaign.objects.bulk_create(chunk)
+    campaign_ids = [campaign.pk for campaign in rows]
+    del rows
+
+    log(f"Creating {donations} donations...")
+    donor_pool = max(1, donations // 5)
+    created = 0
+    while created < donations:
+        chunk = []
+        for k in range(created, min(created + chunk_size, donations)):
+            # Cubing favours the first campaigns: a few get most donations.
+            campaign_id = campaign_ids[int(len(campaign_ids) * rng.random() ** 3)]
+            if rng.random() < 0.1:
+                email = owner_email(rng.randrange(owner_count))
+            else:
+                email = f"donor{rng.randrange(donor_pool)}@benchmark.local"
+            chunk.append(Donation(
+                id=_uuid(rng),
+                campaign_id=campaign_id,
+                fullname=f"Donor {k}",
+                email=email,
+                email_hash=gravatar_hash(email),
+                country="India",
+                postal_code="110001",
+                donation=rng.randrange(5, 5_000),
+                anonymous=rng.random() < 0.1,
+                approved=rng.random() < 0.85,
+                date=today - timedelta(days=rng.randrange(365)),
+            ))
+        Donation.objects.bulk_create(chunk)
+        created += len(chunk)
+        log(f"  {created}/{donations}")
+
+    # One set-based pass each instead of a per-row rollup upsert per donation.
+    log("Computing totals and rollups...")
+    quiet = io.StringIO()
+    call_command("reconcile_campaign_totals", stdout=quiet)
+    call_command("backfill_daily_stats", window_days=31, stdout=quiet)
+    call_command("repair_platform_stats", stdout=quiet)
+    # Reconciling stamps the campaigns it fixed with the current time.
+    Campaign.objects.update(modified_at=now)
+    log("Indexing campaigns for search...")
+    index_campaigns(Campaign.objects.all())
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def default_path(campaigns, donations, seed):
+    # Dated, since a seed is laid out relative to the day it was made.
+    return os.path.join(
+        tempfile.gettempdir(),
+        f"qonty-benchmark-{campaigns}c-{donations}d-s{seed}-{timezone.localdate():%Y%m%d}.sqlite3",
+    )
+
+
+def use_database(path):
+    """Point the default connection of this process at the SQLite file ``path``."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    connection.close()
+    connection.settings_dict["NAME"] = path
+    settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"] = path
+    call_command("migrate", interactive=False, verbosity=0)
+
+
+def prepare_database(path, campaigns, donations, seed=0, reseed=False, log=lambda message: None):
+    """
+    Seed ``path`` unless it already holds a complete seed, then switch this
+    process to it. Never the project database.
+    """
+    if connections[DEFAULT_DB_ALIAS].vendor != "sqlite":
+        raise ValueError("Benchmarks run against a dedicated SQLite database")
+    if os.path.abspath(path) == os.path.abspath(settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"]):
+        raise ValueError("Refusing to seed the project database")
+
+    if reseed and os.path.exists(path):
+        os.remove(path)
+    if os.path.exists(path):
+        log(f"Reusing seeded database {path}")
+    else:
+        # Seed under another name so an interrupted run is never reused.
+        partial = f"{path}.partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        use_database(partial)
+        log(f"Seeding {campaigns} campaigns and {donations} donations into {path}")
+        seed_database(campaigns, donations, seed, log=log)
+        connections[DEFAULT_DB_ALIAS].close()
+        os.replace(partial, path)
+    use_database(path)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from benchmarks.cases import CASES
+from benchmarks.loadtest import ENDPOINTS, ErrorLog, parse_mix, percentile
+from benchmarks.runner import compare, run_benchmarks
+from benchmarks.seed import seed_database
+from campaign.models import Campaign, Donation, DonationDailyStat, PlatformStats
+
+
+class BenchmarkTestCase(TestCase):
+    def setUp(self):
+        seed_database(campaigns=40, donations=400, chunk_size=150)
+
+    def test_seed_matches_the_app_invariants(self):
+        approved = Donation.objects.filter(approved=True).aggregate(total=Sum('donation'))['total']
+        self.assertEqual(Campaign.objects.aggregate(total=Sum('raised_total'))['total'], approved)
+        self.assertEqual(
+            DonationDailyStat.objects.aggregate(total=Sum('approved_amount'))['total'], approved
+        )
+        stats = PlatformStats.load()
+        self.assertEqual((stats.campaigns, stats.raised), (40, approved))
+
+        # Dashboards and deadlines see current activity
+        today = timezone.localdate()
+        self.assertTrue(DonationDailyStat.objects.filter(day__gte=today - timedelta(days=30)).exists())
+        self.assertTrue(Campaign.objects.filter(deadline__gte=today).exists())
+
+    def test_runs_every_case(self):
+        results = run_benchmarks(warmup=1, repeat=2)
+        self.assertEqual(set(results), set(CASES))
+        for result in results.values():
+            self.assertEqual(result['runs'], 2)
+            self.assertLessEqual(result['min_ms'], result['median_ms'])
+        self.assertGreater(results['load_more']['queries'], 0)
+
+        old = {'results': {'load_more': {'median_ms': results['load_more']['median_ms'] * 2}}}
+        [(name, before, after, change)] = compare(old, {'results': results})
+        self.assertEqual((name, change), ('load_more', -50.0))
+
+
+class SeedTestCase(TestCase):
+    def seeded_rows(self, seed):
+        with transaction.atomic():
+            seed_database(campaigns=5, donations=30, seed=seed)
+            rows = (
+                list(User.objects.order_by('username').values_list('username', 'password', 'date_joined')),
+                list(Campaign.objects.order_by('pk').values_list(
+                    'pk', 'user__username', 'date', 'deadline', 'modified_at'
+                )),
+                list(Donation.objects.order_by('pk').values_list('pk', 'campaign_id', 'email', 'date')),
+            )
+            transaction.set_rollback(True)
+        return rows
+
+    def test_rows_depend_only_on_the_seed(self):
+        self.assertEqual(self.seeded_rows(1), self.seeded_rows(1))
+        self.assertNotEqual(self.seeded_rows(1), self.seeded_rows(2))
+
+
+class LoadTestTestCase(TestCase):
+    def test_parse_mix(self):
+        mix = parse_mix('donate=50,home=0')
+        self.assertEqual((mix['donate'], mix['home']), (50, 0))
+        self.assertEqual(mix['detail'], ENDPOINTS['detail'][0])
+        with self.assertRaises(ValueError):
+            parse_mix('checkout=5')
+
+    def test_percentile(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(
+            [percentile(ordered, p) for p in (50, 95, 99, 100)], [50, 95, 99, 100]
+        )
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_attributes_locked_errors_to_endpoints(self):
+        log = ErrorLog()
+        lines = [
+            'Internal Server Error: /campaign/3f1c/donation\n',
+            'Traceback (most recent call last):\n',
+            'sqlite3.OperationalError: database is locked\n',
+            'django.db.utils.OperationalError: database is locked\n',
+            'Internal Server Error: /dashboard/\n',
+            'ZeroDivisionError: division by zero\n',
+        ]
+        for line in lines:
+            log.feed(line)
+        self.assertEqual(sum(log.locked.values()), 0)
+
+        log.counting = True
+        for line in lines:
+            log.feed(line)
+        self.assertEqual(log.locked, {'donate': 1})
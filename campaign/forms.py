@@ -23,6 +23,10 @@ class CampaignForm(forms.ModelForm):
 
 
 class DonationForm(forms.ModelForm):
+    # Generated when the form is rendered; replays of the same submission
+    # carry the same key and resolve to the donation it created.
+    idempotency_key = forms.UUIDField(widget=forms.HiddenInput, required=False)
+
     class Meta:
         model = Donation
         exclude = ('date', 'approved', 'campaign')
@@ -32,3 +36,17 @@ class DonationForm(forms.ModelForm):
         if amount < 5:
             raise ValidationError("Amount must be greater or equal to ₹5")
         return amount
+
+
+class DonationImportRowForm(DonationForm):
+    """Validates one imported row; the campaign is resolved by the importer."""
+
+    # Imported rows are not form submissions and are never replayed.
+    idempotency_key = None
+
+    class Meta(DonationForm.Meta):
+        exclude = ('campaign',)
+
+
+class DonationImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV with a header row, or JSON Lines (.jsonl)')
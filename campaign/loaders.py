@@ -0,0 +1,90 @@
+from collections import namedtuple
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.models import Count, Q, Sum
+
+CampaignStats = namedtuple("CampaignStats", ["raised", "donors", "pending"])
+
+EMPTY_STATS = CampaignStats(0, 0, 0)
+
+_current_loader = ContextVar("campaign_stats_loader", default=None)
+
+
+def get_stats_loader():
+    """Return the stats loader of the request being handled, if any."""
+    return _current_loader.get()
+
+
+class CampaignStatsLoader:
+    """
+    Request-scoped batch loader for campaign donation totals.
+
+    Campaigns are queued with prime() as they are loaded; the first load()
+    resolves everything queued so far with a single GROUP BY campaign_id
+    query and later lookups are served from memory.
+    """
+
+    def __init__(self):
+        self._queued = set()
+        self._resolved = {}
+
+    def prime(self, campaign_id):
+        if campaign_id not in self._resolved:
+            self._queued.add(campaign_id)
+
+    def load(self, campaign_id):
+        if campaign_id not in self._resolved:
+            self._queued.add(campaign_id)
+            self._resolve()
+        return self._resolved[campaign_id]
+
+    def _resolve(self):
+        from .models import Donation
+
+        campaign_ids, self._queued = self._queued, set()
+        self._resolved.update(dict.fromkeys(campaign_ids, EMPTY_STATS))
+        rows = (
+            Donation.objects.filter(campaign_id__in=campaign_ids)
+            .values("campaign_id")
+            .annotate(
+                raised=Sum("donation", filter=Q(approved=True)),
+                donors=Count("id", filter=Q(approved=True)),
+                pending=Sum("donation", filter=Q(approved=False)),
+            )
+            .order_by()
+        )
+        for row in rows:
+            self._resolved[row["campaign_id"]] = CampaignStats(
+                row["raised"] or 0, row["donors"], row["pending"] or 0
+            )
+
+
+class CampaignStatsLoaderMiddleware:
+    """Give every request its own CampaignStatsLoader."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.campaign_stats = CampaignStatsLoader()
+        token = _current_loader.set(request.campaign_stats)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_loader.reset(token)
+
+    async def __acall__(self, request):
+        request.campaign_stats = CampaignStatsLoader()
+        token = _current_loader.set(request.campaign_stats)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_loader.reset(token)
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Min, Max, Q, Sum
+
+from campaign.models import Donation, DonationDailyStat, DonorDailyStat, OwnerDailyStat
+
+ROLLUPS = (
+    (DonationDailyStat, 'campaign_id', 'campaign_id'),
+    (OwnerDailyStat, 'owner_id', 'campaign__user_id'),
+    (DonorDailyStat, 'email', 'email'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily donation rollups from the donation history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window-days', type=int, default=30,
+                            help='Number of days of history to rebuild per transaction')
+
+    def handle(self, *args, **options):
+        window = timedelta(days=options['window_days'])
+        bounds = Donation.objects.aggregate(first=Min('date'), last=Max('date'))
+        if bounds['first'] is None:
+            self.stdout.write(self.style.SUCCESS('No donations to roll up'))
+            return
+
+        start = bounds['first']
+        rows = 0
+        while start <= bounds['last']:
+            end = start + window
+            with transaction.atomic():
+                # Rebuilding a window replaces its rows wholesale, so running
+                # the command again (or after a partial run) is safe.
+                for model, key, source in ROLLUPS:
+                    model.objects.filter(day__gte=start, day__lt=end).delete()
+                    stats = [
+                        model(**{key: row['key']}, **{f: row[f] for f in (
+                            'day', 'amount', 'count', 'approved_amount', 'approved_count'
+                        )})
+                        for row in Donation.objects.filter(date__gte=start, date__lt=end)
+                        .values(key=F(source), day=F('date'))
+                        .annotate(
+                            amount=Sum('donation'),
+                            count=Count('id'),
+                            approved_amount=Sum('donation', filter=Q(approved=True), default=0),
+                            approved_count=Count('id', filter=Q(approved=True)),
+                        )
+                        .order_by()
+                    ]
+                    model.objects.bulk_create(stats, batch_size=500)
+                    rows += len(stats)
+            self.stdout.write(f"Rolled up donations up to {end - timedelta(days=1)}")
+            start = end
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} daily rollup rows'))
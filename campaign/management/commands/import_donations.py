@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from campaign.imports import FORMATS, detect_format, import_donations
+
+
+class Command(BaseCommand):
+    help = 'Import offline donations from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or JSON Lines file')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format (default: guessed from the extension)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Number of rows to validate and insert per transaction')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or detect_format(options['path'])
+        try:
+            stream = open(options['path'], 'rb')
+        except OSError as e:
+            raise CommandError(e)
+
+        with stream:
+            result = import_donations(stream, fmt, options['chunk_size'])
+
+        for line, message in result.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        if result.skipped > len(result.errors):
+            self.stderr.write(f"... and {result.skipped - len(result.errors)} more invalid rows")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.imported} donations, skipped {result.skipped} invalid rows'
+        ))
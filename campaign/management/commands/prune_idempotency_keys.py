@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from campaign.models import IDEMPOTENCY_KEY_TTL, DonationIdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete donation idempotency keys older than their time to live'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Number of keys to delete per statement')
+
+    def handle(self, *args, **options):
+        cutoff = now() - IDEMPOTENCY_KEY_TTL
+        deleted = 0
+        while True:
+            # Delete in bounded chunks walking the created_at index, so a
+            # large backlog never holds one long-running lock.
+            keys = list(
+                DonationIdempotencyKey.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values_list('pk', flat=True)[:options['chunk_size']]
+            )
+            if not keys:
+                break
+            deleted += DonationIdempotencyKey.objects.filter(pk__in=keys).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from campaign import search
+from campaign.models import Campaign
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text campaign search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of campaigns to index per transaction')
+
+    def handle(self, *args, **options):
+        connection = connections[Campaign.objects.db]
+        if connection.vendor not in search.SUPPORTED_VENDORS:
+            self.stdout.write(self.style.WARNING(
+                f'Full-text search is not supported on {connection.vendor}; nothing to rebuild'
+            ))
+            return
+
+        search.clear_index(connection)
+        indexed = 0
+        last_pk = None
+        while True:
+            campaigns = Campaign.objects.order_by('pk')
+            if last_pk is not None:
+                campaigns = campaigns.filter(pk__gt=last_pk)
+            chunk = list(campaigns.values_list('pk', flat=True)[:options['chunk_size']])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            with transaction.atomic():
+                search.index_campaigns(Campaign.objects.filter(pk__in=chunk))
+            indexed += len(chunk)
+            self.stdout.write(f'Indexed {indexed} campaigns')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {indexed} campaigns'))
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils.timezone import now
+
+from campaign.models import Campaign, Donation, STATS_FIELDS, VERSION_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored raised/donor/pending totals of every campaign from its donations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of campaigns to reconcile per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted campaigns without fixing them')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checked = fixed = 0
+        last_pk = None
+
+        while True:
+            with transaction.atomic():
+                campaigns = Campaign.objects.order_by('pk').only('pk', *STATS_FIELDS)
+                if last_pk is not None:
+                    campaigns = campaigns.filter(pk__gt=last_pk)
+                # Lock the chunk so donations written meanwhile wait for us and
+                # then apply their deltas on top of the recomputed totals.
+                chunk = list(campaigns.select_for_update()[:chunk_size])
+                if not chunk:
+                    break
+                last_pk = chunk[-1].pk
+
+                totals = {
+                    row['campaign_id']: row
+                    for row in Donation.objects.filter(campaign__in=chunk)
+                    .values('campaign_id')
+                    .annotate(
+                        raised=Sum('donation', filter=Q(approved=True)),
+                        donors=Count('id', filter=Q(approved=True)),
+                        pending=Sum('donation', filter=Q(approved=False)),
+                    )
+                    .order_by()
+                }
+
+                drifted = []
+                for campaign in chunk:
+                    row = totals.get(campaign.pk, {})
+                    expected = (
+                        row.get('raised') or 0,
+                        row.get('donors') or 0,
+                        row.get('pending') or 0,
+                    )
+                    if expected != tuple(getattr(campaign, f) for f in STATS_FIELDS):
+                        campaign.raised_total, campaign.donor_count, campaign.pending_total = expected
+                        campaign.cache_version = F('cache_version') + 1
+                        campaign.modified_at = now()
+                        drifted.append(campaign)
+
+                if drifted and not options['dry_run']:
+                    Campaign.objects.bulk_update(drifted, [*STATS_FIELDS, *VERSION_FIELDS])
+
+            checked += len(chunk)
+            fixed += len(drifted)
+            self.stdout.write(f"Checked {checked} campaigns, {fixed} drifted")
+
+        verb = 'would be fixed' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled {checked} campaigns, {fixed} {verb}'
+        ))
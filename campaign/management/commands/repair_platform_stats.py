@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from campaign.models import PlatformStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the platform-wide KPI counters from the member, campaign and donation tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted counters without fixing them')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the row so writes made meanwhile wait for us and then apply
+            # their deltas on top of the recomputed counters.
+            stats = PlatformStats.objects.select_for_update().filter(
+                pk=PlatformStats.SINGLETON_ID
+            ).first() or PlatformStats(pk=PlatformStats.SINGLETON_ID)
+            expected = PlatformStats.compute()
+
+            drifted = {
+                field: (getattr(stats, field), value)
+                for field, value in expected.items()
+                if getattr(stats, field) != value
+            }
+            for field, (stored, value) in drifted.items():
+                self.stdout.write(f"{field}: {stored} -> {value}")
+
+            if drifted and not options['dry_run']:
+                for field, value in expected.items():
+                    setattr(stats, field, value)
+                stats.save()
+
+        verb = 'would be fixed' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(expected)} counters, {len(drifted)} {verb}'
+        ))
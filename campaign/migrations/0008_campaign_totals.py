@@ -0,0 +1,55 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:23
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_totals(apps, schema_editor):
+    Campaign = apps.get_model("campaign", "Campaign")
+    Donation = apps.get_model("campaign", "Donation")
+    totals = (
+        Donation.objects.values("campaign_id")
+        .annotate(
+            raised=Sum("donation", filter=Q(approved=True)),
+            donors=Count("id", filter=Q(approved=True)),
+            pending=Sum("donation", filter=Q(approved=False)),
+        )
+        .order_by()
+    )
+    for row in totals.iterator():
+        Campaign.objects.filter(pk=row["campaign_id"]).update(
+            raised_total=row["raised"] or 0,
+            donor_count=row["donors"],
+            pending_total=row["pending"] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0007_auto_20251008_1058'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='donor_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='pending_total',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='raised_total',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='campaign',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('deleted', 'Deleted'), ('completed', 'Completed'), ('active', 'Active')], default='pending', max_length=20),
+        ),
+        migrations.RunPython(populate_totals, migrations.RunPython.noop),
+    ]
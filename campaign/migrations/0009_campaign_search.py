@@ -0,0 +1,65 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:27
+
+import campaign.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_search_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE campaign_search USING fts5("
+            "campaign_id UNINDEXED, title, document, tokenize='porter unicode61')"
+        )
+        # Rank title hits well above description/location/category hits.
+        schema_editor.execute(
+            "INSERT INTO campaign_search (campaign_search, rank) "
+            "VALUES ('rank', 'bm25(0.0, 10.0, 1.0)')"
+        )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE campaign_search ("
+            "campaign_id uuid PRIMARY KEY, document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX campaign_search_document_gin "
+            "ON campaign_search USING gin (document)"
+        )
+    else:
+        return
+
+    Campaign = apps.get_model('campaign', 'Campaign')
+    campaign.search.index_rows(
+        connection,
+        Campaign.objects.values_list(
+            'id', 'title', 'description', 'location', 'category__name'
+        ).iterator(),
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in campaign.search.SUPPORTED_VENDORS:
+        schema_editor.execute("DROP TABLE campaign_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0008_campaign_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignSearchDocument',
+            fields=[
+                ('campaign', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='campaign.campaign')),
+                ('document', campaign.search.SearchDocumentField()),
+            ],
+            options={
+                'db_table': 'campaign_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0009_campaign_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('amount', models.BigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+                ('approved_amount', models.BigIntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('email', models.EmailField(max_length=254)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OwnerDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('amount', models.BigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+                ('approved_amount', models.BigIntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DonationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('amount', models.BigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+                ('approved_amount', models.BigIntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='campaign.campaign')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='donordailystat',
+            constraint=models.UniqueConstraint(fields=('email', 'day'), name='unique_donor_daily_stat'),
+        ),
+        migrations.AddField(
+            model_name='ownerdailystat',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='donationdailystat',
+            index=models.Index(fields=['day'], name='campaign_do_day_d7b96b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='donationdailystat',
+            constraint=models.UniqueConstraint(fields=('campaign', 'day'), name='unique_campaign_daily_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='ownerdailystat',
+            constraint=models.UniqueConstraint(fields=('owner', 'day'), name='unique_owner_daily_stat'),
+        ),
+    ]
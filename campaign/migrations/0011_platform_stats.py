@@ -0,0 +1,28 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0010_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('members', models.IntegerField(default=0)),
+                ('campaigns', models.IntegerField(default=0)),
+                ('active_campaigns', models.IntegerField(default=0)),
+                ('donations', models.IntegerField(default=0)),
+                ('raised', models.BigIntegerField(default=0)),
+                ('pending', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+    ]
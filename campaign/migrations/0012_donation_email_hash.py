@@ -0,0 +1,41 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:35
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def populate_email_hashes(apps, schema_editor):
+    Donation = apps.get_model("campaign", "Donation")
+    last_pk = None
+    while True:
+        batch = Donation.objects.order_by("pk").only("pk", "email")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            break
+        for donation in batch:
+            donation.email_hash = hashlib.md5(
+                (donation.email or "").strip().lower().encode("utf-8")
+            ).hexdigest()
+        Donation.objects.bulk_update(batch, ["email_hash"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0011_platform_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(populate_email_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0012_donation_email_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
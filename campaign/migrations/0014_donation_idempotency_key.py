@@ -0,0 +1,23 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0013_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationIdempotencyKey',
+            fields=[
+                ('key', models.UUIDField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='campaign.campaign')),
+                ('donation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='campaign.donation')),
+            ],
+        ),
+    ]
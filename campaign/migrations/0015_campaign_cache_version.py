@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0014_donation_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='cache_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
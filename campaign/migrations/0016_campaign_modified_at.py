@@ -0,0 +1,19 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0015_campaign_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='modified_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
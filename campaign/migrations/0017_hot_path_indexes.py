@@ -0,0 +1,40 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaign', '0016_campaign_modified_at'),
+        ('core', '0006_outbox_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['date', 'id'], name='campaign_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['user', 'date'], name='campaign_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('is_active', True), ('status__in', ('approved', 'active')), _connector='OR'), fields=['date'], name='campaign_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['campaign', 'date', 'id'], name='donation_approved_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['email', 'date', 'id'], name='donation_email_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['date', 'id'], name='donation_date_id_idx'),
+        ),
+    ]
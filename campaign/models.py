@@ -1,13 +1,19 @@
+import functools
 import hashlib
 import uuid
-from datetime import datetime
-from django.db import models
-from django.utils.http import urlencode
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+from django.db import IntegrityError, models, transaction
 from django.utils.timezone import now
 from django.templatetags.static import static
-from django.db.models import Sum
+from django.db.models import Case, F, FloatField, OuterRef, Subquery, Sum, Count, Value, When
+from django.db.models.functions import Coalesce
 from accounts.models import User
+from core.images import ImageVariantsMixin
 from core.models import Category
+from core.page_cache import bump_page_versions
+from .loaders import CampaignStats, get_stats_loader
+from .search import SEARCH_TABLE, SearchDocumentField
 
 
 class CampaignStatusChoices(models.TextChoices):
@@ -19,7 +25,61 @@ class CampaignStatusChoices(models.TextChoices):
     ACTIVE = "active", "Active"
 
 
-class Campaign(models.Model):
+ACTIVE_STATUSES = ("approved", "active")
+
+PLATFORM_FEE = 0.05
+
+
+class CampaignQuerySet(models.QuerySet):
+    def active(self):
+        """Campaigns shown as running: flagged active or in an active status."""
+        return self.filter(models.Q(is_active=True) | models.Q(status__in=ACTIVE_STATUSES))
+
+    def with_stats(self, live=False):
+        """
+        Annotate each campaign with its approved total (``stats_raised``),
+        donor count (``stats_donors``), progress percentage
+        (``stats_progress``) and time left until the deadline
+        (``stats_time_remaining``) in the same SELECT.
+
+        By default the totals come from the stored columns; ``live=True``
+        recomputes them from the approved donations with correlated subqueries.
+        """
+        if live:
+            approved = Donation.objects.filter(
+                campaign=OuterRef("pk"), approved=True
+            ).order_by().values("campaign")
+            raised = Coalesce(
+                Subquery(approved.annotate(total=Sum("donation")).values("total")),
+                0,
+                output_field=models.BigIntegerField(),
+            )
+            donors = Coalesce(
+                Subquery(approved.annotate(total=Count("id")).values("total")),
+                0,
+                output_field=models.IntegerField(),
+            )
+        else:
+            raised = F("raised_total")
+            donors = F("donor_count")
+
+        return self.annotate(
+            stats_raised=raised,
+            stats_donors=donors,
+        ).annotate(
+            stats_progress=Case(
+                When(
+                    goal__gt=0,
+                    then=F("stats_raised") * Value(100.0) / F("goal"),
+                ),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            stats_time_remaining=F("deadline") - Value(datetime.now().date()),
+        )
+
+
+class Campaign(ImageVariantsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -36,10 +96,82 @@ class Campaign(models.Model):
     location = models.CharField(max_length=150)
     deadline = models.DateField()
     is_active = models.BooleanField(default=False)
+    # Denormalized donation totals, maintained by apply_donation_changes()
+    raised_total = models.BigIntegerField(default=0, editable=False)
+    donor_count = models.IntegerField(default=0, editable=False)
+    pending_total = models.BigIntegerField(default=0, editable=False)
+    # Part of the cache key of fragments rendered from this campaign; bumped by
+    # edits and by donation writes through apply_donation_changes.
+    cache_version = models.PositiveIntegerField(default=0, editable=False)
+    # When cache_version last changed, for Last-Modified headers.
+    modified_at = models.DateTimeField(default=now, editable=False)
+
+    objects = CampaignQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Newest-first listings and the admin keyset pages.
+            models.Index(fields=["date", "id"], name="campaign_date_id_idx"),
+            # An owner's campaigns, newest first.
+            models.Index(fields=["user", "date"], name="campaign_user_date_idx"),
+            # The home page's most recent running campaigns; matches
+            # CampaignQuerySet.active().
+            models.Index(
+                fields=["date"],
+                name="campaign_active_date_idx",
+                condition=models.Q(is_active=True) | models.Q(status__in=ACTIVE_STATUSES),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Campaigns loaded without their stored totals get them batched by the
+        # request's stats loader instead of one refresh query each.
+        if "raised_total" not in field_names:
+            loader = get_stats_loader()
+            if loader is not None:
+                loader.prime(instance.pk)
+        return instance
+
+    def _stored_stats(self):
+        if "raised_total" not in self.__dict__:
+            loader = get_stats_loader()
+            if loader is not None:
+                return loader.load(self.pk)
+        return CampaignStats(self.raised_total, self.donor_count, self.pending_total)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        # Never write the in-memory totals back over the ones kept up to date
+        # by donation writes.
+        if not adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in STATS_FIELDS + VERSION_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        if not adding:
+            self.bump_cache_version()
+
+    def bump_cache_version(self):
+        """Invalidate the cached fragments rendered for this campaign."""
+        modified_at = now()
+        Campaign.objects.filter(pk=self.pk).update(
+            cache_version=F("cache_version") + 1, modified_at=modified_at
+        )
+        if "cache_version" not in self.get_deferred_fields():
+            self.cache_version += 1
+        self.modified_at = modified_at
+
+    @property
+    def counts_as_active(self):
+        return self.is_active or self.status in ACTIVE_STATUSES
+
     def image_url(self):
         try:
             if self.image and hasattr(self.image, 'url'):
@@ -50,49 +182,58 @@ class Campaign(models.Model):
             return f"https://picsum.photos/seed/{self.id}/600/400"
 
     def days_remaining(self):
+        if hasattr(self, "stats_time_remaining"):
+            return self.stats_time_remaining.days
         delta = self.deadline - datetime.now().date()
         return delta.days
 
     @property
     def total_raised(self):
-        return (
-            self.donation_set.filter(approved=True).aggregate(Sum("donation"))[
-                "donation__sum"
-            ]
-            or 0
-        )
+        if hasattr(self, "stats_raised"):
+            return self.stats_raised
+        return self._stored_stats().raised
+
+    @property
+    def total_donors(self):
+        if hasattr(self, "stats_donors"):
+            return self.stats_donors
+        return self._stored_stats().donors
+
+    @property
+    def progress_percentage(self):
+        if hasattr(self, "stats_progress"):
+            return self.stats_progress
+        return (self.total_raised / self.goal * 100) if self.goal > 0 else 0
 
     def total_donations(self):
-        return self.donation_set.aggregate(Sum("donation"))["donation__sum"] or 0
+        stats = self._stored_stats()
+        return stats.raised + stats.pending
 
     def total_donations_approved(self):
-        return (
-            self.donation_set.filter(approved=True).aggregate(Sum("donation"))[
-                "donation__sum"
-            ]
-            or 0
-        )
+        return self._stored_stats().raised
 
     def total_donations_pending(self):
-        return (
-            self.donation_set.filter(approved=False).aggregate(Sum("donation"))[
-                "donation__sum"
-            ]
-            or 0
-        )
+        return self._stored_stats().pending
 
     def total_donations_rejected(self):
-        return (
-            self.donation_set.filter(approved=False).aggregate(Sum("donation"))[
-                "donation__sum"
-            ]
-            or 0
-        )
+        return self._stored_stats().pending
 
     def get_status_display(self):
         return self.status.upper()
 
 
+GRAVATAR_URL = "https://www.gravatar.com/avatar/{}.jpg?s=40"
+
+
+def gravatar_hash(email):
+    return hashlib.md5((email or "").strip().lower().encode("utf-8")).hexdigest()
+
+
+@functools.cache
+def default_avatar():
+    return static("img/default.jpg")
+
+
 class Donation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
@@ -105,40 +246,311 @@ class Donation(models.Model):
     approved = models.BooleanField(default=False)
     comment = models.TextField(blank=True, null=True)
     date = models.DateField()
+    email_hash = models.CharField(max_length=32, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # A campaign's approved donations, newest first (detail page,
+            # donation page and the load-more feed).
+            models.Index(
+                fields=["campaign", "date", "id"],
+                name="donation_approved_feed_idx",
+                condition=models.Q(approved=True),
+            ),
+            # Everything given from one email address, newest first.
+            models.Index(fields=["email", "date", "id"], name="donation_email_date_id_idx"),
+            # Newest-first lists across all campaigns and the admin keyset pages.
+            models.Index(fields=["date", "id"], name="donation_date_id_idx"),
+        ]
 
     def __str__(self):
         return "{} donate {}".format(self.fullname, self.donation)
 
+    def save(self, *args, **kwargs):
+        self.email_hash = gravatar_hash(self.email)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "email" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "email_hash"}
+        with transaction.atomic():
+            before = None
+            if not self._state.adding:
+                row = (
+                    Donation.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list(*DonationState._fields)
+                    .first()
+                )
+                before = DonationState(*row) if row else None
+            super().save(*args, **kwargs)
+            apply_donation_changes([(before, self.stats_state())])
+
+    def stats_state(self):
+        return DonationState(
+            self.campaign_id, self.donation, self.approved, self.date, self.email
+        )
+
     @property
     def name(self):
         return "Anonymous" if self.anonymous else self.fullname
 
     @property
     def avatar(self):
-        try:
-            default = static("img/default.jpg")
-            size = 40
-            query_string = urlencode(
-                {
-                    "s": str(size),
-                }
-            )
-
-            url_base = "https://www.gravatar.com/"
-            email_hash = hashlib.md5(self.email.strip().lower().encode("utf-8")).hexdigest()
-
-            # Build url
-            url = "{base}avatar/{hash}.jpg?{qs}".format(
-                base=url_base, hash=email_hash, qs=query_string
-            )
-            return default if self.anonymous else url
-        except (ValueError, AttributeError):
-            return static("img/default.jpg")
+        if self.anonymous:
+            return default_avatar()
+        return GRAVATAR_URL.format(self.email_hash or gravatar_hash(self.email))
 
     @property
     def admin_earnings(self):
-        return self.donation * 0.05
+        return self.donation * PLATFORM_FEE
     
     @property
     def admin_earnings_formatted(self):
         return f"${self.admin_earnings:.2f}"
+
+
+IDEMPOTENCY_KEY_TTL = timedelta(days=1)
+
+
+class DonationIdempotencyKey(models.Model):
+    """
+    The donation created by a form submission, keyed by the idempotency key
+    the form carried, so a replayed submission finds its original donation
+    with one primary-key read instead of creating another one.
+    """
+
+    key = models.UUIDField(primary_key=True)
+    donation = models.OneToOneField(Donation, on_delete=models.CASCADE)
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class CampaignSearchDocument(models.Model):
+    """
+    A campaign's row in the full-text index. The table is created by the
+    migrations per database backend and written through ``campaign.search``.
+    """
+
+    campaign = models.OneToOneField(
+        Campaign,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="search_document",
+    )
+    document = SearchDocumentField()
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
+
+
+VERSION_FIELDS = ("cache_version", "modified_at")
+
+STATS_FIELDS = ("raised_total", "donor_count", "pending_total")
+
+# The slice of a donation row that the stored totals and daily rollups depend
+# on. The field names double as the column names to read the row back with.
+DonationState = namedtuple(
+    "DonationState", ["campaign_id", "donation", "approved", "date", "email"]
+)
+
+
+class DailyStat(models.Model):
+    """Donation amounts and counts for one day, all and approved only."""
+
+    day = models.DateField()
+    amount = models.BigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+    approved_amount = models.BigIntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def bump(cls, deltas):
+        """
+        Add ``deltas`` ({(key, day): (amount, count, approved_amount,
+        approved_count)}) to the matching rows, creating missing ones.
+        """
+        for (key, day), (amount, count, approved_amount, approved_count) in deltas.items():
+            if not (amount or count or approved_amount or approved_count):
+                continue
+            lookup = {cls.rollup_key: key, "day": day}
+            changes = dict(
+                amount=F("amount") + amount,
+                count=F("count") + count,
+                approved_amount=F("approved_amount") + approved_amount,
+                approved_count=F("approved_count") + approved_count,
+            )
+            if cls.objects.filter(**lookup).update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        amount=amount,
+                        count=count,
+                        approved_amount=approved_amount,
+                        approved_count=approved_count,
+                        **lookup,
+                    )
+            except IntegrityError:
+                # Created concurrently since our UPDATE; add to that row instead.
+                cls.objects.filter(**lookup).update(**changes)
+
+
+class DonationDailyStat(DailyStat):
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE)
+
+    rollup_key = "campaign_id"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "day"], name="unique_campaign_daily_stat"),
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+
+class OwnerDailyStat(DailyStat):
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+
+    rollup_key = "owner_id"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "day"], name="unique_owner_daily_stat"),
+        ]
+
+
+class DonorDailyStat(DailyStat):
+    email = models.EmailField()
+
+    rollup_key = "email"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["email", "day"], name="unique_donor_daily_stat"),
+        ]
+
+
+class PlatformStats(models.Model):
+    """
+    Platform-wide counters in a single row, adjusted in place by the writes
+    that change them so pages read every KPI with one primary-key lookup.
+    ``manage.py repair_platform_stats`` recomputes them from the tables.
+    """
+
+    SINGLETON_ID = 1
+
+    members = models.IntegerField(default=0)
+    campaigns = models.IntegerField(default=0)
+    active_campaigns = models.IntegerField(default=0)
+    donations = models.IntegerField(default=0)
+    raised = models.BigIntegerField(default=0)
+    pending = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "platform stats"
+
+    @classmethod
+    def load(cls):
+        stats = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if stats is None:
+            stats, _ = cls.objects.get_or_create(pk=cls.SINGLETON_ID, defaults=cls.compute())
+        return stats
+
+    @classmethod
+    def compute(cls):
+        """Count every KPI from scratch."""
+        donations = Donation.objects.aggregate(
+            donations=Count("id", filter=models.Q(approved=True)),
+            raised=Sum("donation", filter=models.Q(approved=True), default=0),
+            pending=Sum("donation", filter=models.Q(approved=False), default=0),
+        )
+        return dict(
+            members=User.objects.count(),
+            campaigns=Campaign.objects.count(),
+            active_campaigns=Campaign.objects.active().count(),
+            **donations,
+        )
+
+    @classmethod
+    def bump(cls, **deltas):
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if changes:
+            # Without a row there is nothing to adjust; load() seeds it from
+            # the tables, which already include this write.
+            cls.objects.filter(pk=cls.SINGLETON_ID).update(**changes)
+
+    @property
+    def platform_earnings(self):
+        return self.raised * PLATFORM_FEE
+
+
+def apply_donation_changes(changes):
+    """
+    Fold donation writes into the stored campaign totals, daily rollups and
+    platform stats.
+
+    ``changes`` is an iterable of ``(before, after)`` DonationState pairs, with
+    ``before`` set to None for inserts and ``after`` set to None for deletes.
+    Deltas are summed per campaign and per rollup row and applied with one
+    UPDATE each, so call it inside the transaction that wrote the donations.
+    """
+    totals = defaultdict(lambda: [0, 0, 0])
+    daily = defaultdict(lambda: [0, 0, 0, 0])
+    donors = defaultdict(lambda: [0, 0, 0, 0])
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            amount = sign * state.donation
+            delta = totals[state.campaign_id]
+            if state.approved:
+                delta[0] += amount
+                delta[1] += sign
+            else:
+                delta[2] += amount
+
+            for rollup in (daily[state.campaign_id, state.date], donors[state.email, state.date]):
+                rollup[0] += amount
+                rollup[1] += sign
+                if state.approved:
+                    rollup[2] += amount
+                    rollup[3] += sign
+
+    for campaign_id, (raised, donors_delta, pending) in totals.items():
+        if not (raised or donors_delta or pending):
+            continue
+        if raised or donors_delta:
+            # Listings show the raised total and donor count, not pending.
+            bump_page_versions("listing", f"campaign:{campaign_id}")
+        else:
+            bump_page_versions(f"campaign:{campaign_id}")
+        Campaign.objects.filter(pk=campaign_id).update(
+            raised_total=F("raised_total") + raised,
+            donor_count=F("donor_count") + donors_delta,
+            pending_total=F("pending_total") + pending,
+            cache_version=F("cache_version") + 1,
+            modified_at=now(),
+        )
+
+    owners = dict(
+        Campaign.objects.filter(pk__in={campaign_id for campaign_id, _ in daily})
+        .values_list("pk", "user_id")
+    ) if daily else {}
+    by_owner = defaultdict(lambda: [0, 0, 0, 0])
+    for (campaign_id, day), delta in daily.items():
+        if campaign_id in owners:
+            rollup = by_owner[owners[campaign_id], day]
+            for index, value in enumerate(delta):
+                rollup[index] += value
+
+    DonationDailyStat.bump(daily)
+    OwnerDailyStat.bump(by_owner)
+    DonorDailyStat.bump(donors)
+    PlatformStats.bump(
+        raised=sum(delta[0] for delta in totals.values()),
+        donations=sum(delta[1] for delta in totals.values()),
+        pending=sum(delta[2] for delta in totals.values()),
+    )
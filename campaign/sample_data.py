@@ -0,0 +1,218 @@
+"""
+Fake rows for ``manage.py generate_sample_data``.
+
+Nothing here touches the database or imports Django, so batches can be
+generated in worker processes that start cheaply. Each batch draws from
+its own Random and Faker seeded with the run seed, the row kind and the
+batch number. A given seed therefore produces the same rows whatever the
+number of workers. Foreign keys are picked from id arrays the command
+preloads into every worker with init_worker().
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from faker import Faker
+
+CAMPAIGN_TEMPLATES = {
+    'Technology': {
+        'titles': [
+            "Revolutionary AI-Powered Smart Home Assistant",
+            "Eco-Friendly Solar Backpack with USB Charging",
+            "Next-Gen Wireless Earbuds with Translation",
+            "Sustainable Smart Water Bottle",
+            "Innovative Portable Air Purifier"
+        ],
+        'descriptions': [
+            "Help us bring cutting-edge technology to everyday life. Our team of engineers has developed {product} "
+            "that will revolutionize how people {action}. With your support, we can begin mass production and "
+            "make this innovation available to everyone at an affordable price."
+        ]
+    },
+    'Arts': {
+        'titles': [
+            "Urban Art Gallery for Local Artists",
+            "Community Mural Project",
+            "Indigenous Art Preservation Initiative",
+            "Youth Art Education Program",
+            "Public Sculpture Garden"
+        ],
+        'descriptions': [
+            "We're creating a space where art can thrive and inspire our community. This project will {action} "
+            "and provide opportunities for {beneficiary}. Your support will help fund materials, space, "
+            "and resources needed to make this vision a reality."
+        ]
+    },
+    'Film': {
+        'titles': [
+            "Independent Documentary: Ocean Conservation",
+            "Short Film Series: Urban Stories",
+            "Feature Film: Tales of Immigration",
+            "Youth Film Workshop Program",
+            "Documentary: Local Heroes"
+        ],
+        'descriptions': [
+            "Our passionate film team is dedicated to telling the untold story of {subject}. "
+            "This project will shed light on {issue} and inspire change through powerful storytelling. "
+            "Your support will help cover production costs, equipment, and post-production expenses."
+        ]
+    },
+    'Education': {
+        'titles': [
+            "STEM Learning Lab for Underprivileged Kids",
+            "Mobile Library for Rural Communities",
+            "Coding Boot Camp for Women",
+            "Educational Games for Special Needs",
+            "Adult Literacy Program"
+        ],
+        'descriptions': [
+            "Education changes lives. Our initiative aims to provide {beneficiary} with access to quality "
+            "education in {subject}. Your contribution will help us purchase necessary materials, "
+            "hire qualified instructors, and create lasting impact in our community."
+        ]
+    },
+    'Music': {
+        'titles': [
+            "Youth Orchestra Instruments Fund",
+            "Community Music Studio",
+            "Indigenous Music Preservation",
+            "Music Therapy for Seniors",
+            "Street Music Festival"
+        ],
+        'descriptions': [
+            "Music has the power to transform lives. This project will bring {program} to {beneficiary}. "
+            "Your support will help fund instruments, instruction, and create opportunities for "
+            "musical expression and growth in our community."
+        ]
+    }
+}
+
+
+def campaign_text(rng, category_name):
+    """Generate realistic campaign titles and descriptions based on category"""
+    # Default template for categories not specifically defined
+    default_template = {
+        'titles': [
+            f"Community {category_name} Initiative",
+            f"Innovative {category_name} Project",
+            f"Sustainable {category_name} Program",
+            f"Local {category_name} Development",
+            f"{category_name} for All"
+        ],
+        'descriptions': [
+            "Help us make a difference in the field of {category}. This project aims to {action} "
+            "and create positive impact for {beneficiary}. Your support will enable us to "
+            "bring this vision to life and serve our community better."
+        ]
+    }
+
+    template = CAMPAIGN_TEMPLATES.get(category_name, default_template)
+
+    title = rng.choice(template['titles'])
+    description_template = rng.choice(template['descriptions'])
+
+    # Fill in template variables
+    description = description_template.format(
+        product="innovative solution",
+        action="interact with technology",
+        beneficiary="local community members",
+        subject="important social issues",
+        issue="pressing community challenges",
+        program="quality education",
+        category=category_name
+    )
+
+    return title, description
+
+
+# Id arrays and constants shared by every batch of a run, set by init_worker()
+shared = {}
+
+
+def init_worker(values):
+    shared.clear()
+    shared.update(values)
+
+
+def _batch_random(kind, number):
+    key = f"{shared['seed']}:{kind}:{number}"
+    fake = Faker()
+    fake.seed_instance(key)
+    return random.Random(key), fake
+
+
+def user_rows(batch):
+    """Rows for users ``start`` to ``start + count`` (``batch`` is ``(number, start, count)``)."""
+    number, start, count = batch
+    rng, fake = _batch_random("users", number)
+    rows = []
+    for i in range(start, start + count):
+        rows.append(dict(
+            # The index keeps usernames and emails unique across batches
+            username=f"{fake.user_name()}_{i}",
+            email=f"{fake.user_name()}.{i}@{fake.free_email_domain()}",
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            country_id=rng.choice(shared["country_ids"]),
+        ))
+    return rows
+
+
+def campaign_rows(batch):
+    number, start, count = batch
+    rng, fake = _batch_random("campaigns", number)
+    now = shared["now"]
+    rows = []
+    for _ in range(count):
+        category_id, category_name = rng.choice(shared["categories"])
+        title, description = campaign_text(rng, category_name)
+
+        # Generate realistic goal based on category
+        if category_name in ['Technology', 'Film']:
+            goal = rng.randint(25000, 150000)
+        elif category_name in ['Music', 'Arts']:
+            goal = rng.randint(5000, 30000)
+        else:
+            goal = rng.randint(10000, 50000)
+
+        rows.append(dict(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            title=title,
+            description=description,
+            user_id=rng.choice(shared["user_ids"]),
+            category_id=category_id,
+            date=now - timedelta(days=rng.randint(1, 60)),
+            status=rng.choice(['pending', 'active', 'completed']),
+            goal=goal,
+            location=f"{fake.city()}, {fake.country_code()}",
+            deadline=now.date() + timedelta(days=rng.randint(10, 180)),
+        ))
+    return rows
+
+
+def donation_rows(batch):
+    number, start, count = batch
+    rng, fake = _batch_random("donations", number)
+    campaigns = shared["campaigns"]
+    today = shared["now"].date()
+    rows = []
+    for _ in range(count):
+        campaign_id, campaign_date, goal = rng.choice(campaigns)
+        # Generate realistic donation amounts
+        if goal > 50000:
+            amount = rng.randint(50, 5000)
+        else:
+            amount = rng.randint(10, 1000)
+        rows.append(dict(
+            campaign_id=campaign_id,
+            fullname=fake.name(),
+            email=fake.email(),
+            country=fake.country()[:50],
+            postal_code=fake.postcode(),
+            donation=amount,
+            anonymous=rng.random() < 0.5,
+            approved=rng.random() < 0.9,  # Most donations should be approved
+            comment=fake.text(max_nb_chars=200) if rng.random() > 0.7 else None,
+            date=min(today, campaign_date + timedelta(days=rng.randint(1, 30))),
+        ))
+    return rows
@@ -0,0 +1,180 @@
+"""
+Full-text search over campaigns.
+
+The index lives in the ``campaign_search`` table: an FTS5 virtual table on
+SQLite and a ``tsvector`` table with a GIN index on PostgreSQL. It holds one
+row per campaign built from its title, description, location and category
+name, and is kept in sync by the signals in ``campaign.signals``. Other
+backends fall back to ``icontains`` filtering.
+"""
+import re
+
+from django.db import NotSupportedError, connections
+from django.db.models import F, FloatField, Func, Lookup, Q, TextField, Value
+
+SEARCH_TABLE = "campaign_search"
+SUPPORTED_VENDORS = ("sqlite", "postgresql")
+
+
+class SearchDocumentField(TextField):
+    """The indexed document column of ``campaign_search``."""
+
+
+@SearchDocumentField.register_lookup
+class Matches(Lookup):
+    lookup_name = "matches"
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(
+            f"Full-text search is not supported on {connection.vendor}."
+        )
+
+    def as_sqlite(self, compiler, connection):
+        # FTS5 matches against the table itself so every column is searched.
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        table = connection.ops.quote_name(self.lhs.alias)
+        return f"{table} MATCH {rhs}", rhs_params
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ to_tsquery('english', {rhs})", lhs_params + rhs_params
+
+
+class SearchRank(Func):
+    """Relevance of a matched campaign, higher is better."""
+
+    output_field = FloatField()
+
+    def __init__(self, query):
+        super().__init__(F("search_document__document"), Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"Full-text search is not supported on {connection.vendor}."
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # FTS5 exposes bm25() through the hidden rank column, lower is better.
+        table = connection.ops.quote_name(self.source_expressions[0].alias)
+        return f"-{table}.rank", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        document, document_params = compiler.compile(self.source_expressions[0])
+        query, query_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"ts_rank({document}, to_tsquery('english', {query}))",
+            document_params + query_params,
+        )
+
+
+def build_query(vendor, text):
+    """Turn free text into a prefix query for ``vendor``, or None if empty."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    if vendor == "sqlite":
+        return " ".join(f'"{term}"*' for term in terms)
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def search_campaigns(queryset, text):
+    """Filter ``queryset`` down to campaigns matching ``text``, best first."""
+    vendor = connections[queryset.db].vendor
+    if vendor not in SUPPORTED_VENDORS:
+        return queryset.filter(
+            Q(title__icontains=text)
+            | Q(description__icontains=text)
+            | Q(location__icontains=text)
+            | Q(category__name__icontains=text)
+        )
+
+    query = build_query(vendor, text)
+    if query is None:
+        return queryset.none()
+    return (
+        queryset.filter(search_document__document__matches=query)
+        .annotate(search_rank=SearchRank(query))
+        .order_by("-search_rank", "-date")
+    )
+
+
+def _sqlite_rowid(campaign_id):
+    # FTS5 only indexes rowids; derive a stable 63-bit one from the UUID so
+    # updates and deletes are point lookups instead of table scans.
+    return campaign_id.int >> 65
+
+
+def index_rows(connection, rows):
+    """
+    Write index rows for the given campaigns, replacing any existing ones.
+
+    ``rows`` is an iterable of ``(id, title, description, location,
+    category_name)`` tuples.
+    """
+    if connection.vendor not in SUPPORTED_VENDORS:
+        return
+    rows = list(rows)
+    if not rows:
+        return
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            rowids = [(_sqlite_rowid(row[0]),) for row in rows]
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", rowids)
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, campaign_id, title, document) "
+                f"VALUES (%s, %s, %s, %s)",
+                [
+                    (_sqlite_rowid(pk), pk.hex, title, _body(description, location, category))
+                    for pk, title, description, location, category in rows
+                ],
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (campaign_id, document) VALUES "
+                f"(%s, setweight(to_tsvector('english', %s), 'A') || "
+                f"setweight(to_tsvector('english', %s), 'B')) "
+                f"ON CONFLICT (campaign_id) DO UPDATE SET document = EXCLUDED.document",
+                [
+                    (pk, title, _body(description, location, category))
+                    for pk, title, description, location, category in rows
+                ],
+            )
+
+
+def remove_rows(connection, campaign_ids):
+    if connection.vendor not in SUPPORTED_VENDORS:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+                [(_sqlite_rowid(pk),) for pk in campaign_ids],
+            )
+        else:
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE campaign_id = %s",
+                [(pk,) for pk in campaign_ids],
+            )
+
+
+def clear_index(connection):
+    if connection.vendor not in SUPPORTED_VENDORS:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+def index_campaigns(queryset):
+    """(Re)index every campaign in ``queryset``."""
+    index_rows(
+        connections[queryset.db],
+        queryset.values_list(
+            "id", "title", "description", "location", "category__name"
+        ).iterator(),
+    )
+
+
+def _body(description, location, category):
+    return "\n".join(filter(None, (description, location, category)))
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from core.models import Category
+from . import search
+from .models import (
+    ACTIVE_STATUSES, STATS_FIELDS, Campaign, Donation, DonorDailyStat, OwnerDailyStat, PlatformStats,
+    apply_donation_changes,
+)
+
+
+@receiver(post_delete, sender=Donation)
+def remove_donation_from_totals(sender, instance, origin=None, **kwargs):
+    # Donations removed along with their campaign (directly or through its
+    # category) are taken off the platform stats and rollups by
+    # remove_campaign_from_stats.
+    if not (isinstance(origin, Donation) or getattr(origin, "model", None) is Donation):
+        return
+    apply_donation_changes([(instance.stats_state(), None)])
+
+
+@receiver(pre_save, sender=Campaign)
+def remember_campaign_activity(sender, instance, using, **kwargs):
+    instance._was_active = not instance._state.adding and (
+        Campaign.objects.using(using).active().filter(pk=instance.pk).exists()
+    )
+
+
+@receiver(post_save, sender=Campaign)
+def count_campaign(sender, instance, created, **kwargs):
+    PlatformStats.bump(
+        campaigns=int(created),
+        active_campaigns=int(instance.counts_as_active) - int(instance._was_active),
+    )
+
+
+@receiver(pre_delete, sender=Campaign)
+def remove_campaign_from_stats(sender, instance, using, **kwargs):
+    row = Campaign.objects.using(using).filter(pk=instance.pk).values_list(
+        "user_id", "is_active", "status", *STATS_FIELDS
+    ).first()
+    if row is None:
+        return
+    owner_id, is_active, status, raised, donors, pending = row
+
+    # Rollups count the donations that exist, as backfill_daily_stats
+    # rebuilds them; the campaign's own rollup goes with it by cascade.
+    by_owner = defaultdict(lambda: [0, 0, 0, 0])
+    by_donor = {}
+    for email, day, *totals in (
+        Donation.objects.using(using).filter(campaign_id=instance.pk)
+        .values_list("email", "date")
+        .annotate(
+            amount=Sum("donation"),
+            count=Count("id"),
+            approved_amount=Sum("donation", filter=Q(approved=True), default=0),
+            approved_count=Count("id", filter=Q(approved=True)),
+        )
+        .order_by()
+    ):
+        by_donor[email, day] = [-value for value in totals]
+        for index, value in enumerate(totals):
+            by_owner[owner_id, day][index] -= value
+    OwnerDailyStat.bump(by_owner)
+    DonorDailyStat.bump(by_donor)
+
+    PlatformStats.bump(
+        campaigns=-1,
+        active_campaigns=-int(is_active or status in ACTIVE_STATUSES),
+        raised=-raised,
+        donations=-donors,
+        pending=-pending,
+    )
+
+
+@receiver(post_save, sender=User)
+def count_member(sender, created, **kwargs):
+    if created:
+        PlatformStats.bump(members=1)
+
+
+@receiver(post_delete, sender=User)
+def uncount_member(sender, **kwargs):
+    PlatformStats.bump(members=-1)
+
+
+@receiver(post_save, sender=Campaign)
+def generate_campaign_image_variants(sender, instance, raw, **kwargs):
+    if not raw and instance.update_image_variants():
+        instance.bump_cache_version()
+
+
+@receiver(post_delete, sender=Campaign)
+def delete_campaign_image_variants(sender, instance, **kwargs):
+    instance.delete_image_variants()
+
+
+@receiver(post_save, sender=Campaign)
+def index_campaign(sender, instance, using, **kwargs):
+    search.index_campaigns(Campaign.objects.using(using).filter(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=Campaign)
+def unindex_campaign(sender, instance, using, **kwargs):
+    search.remove_rows(connections[using], [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_campaigns(sender, instance, created, using, **kwargs):
+    if not created:
+        search.index_campaigns(Campaign.objects.using(using).filter(category=instance))
@@ -1,9 +1,24 @@
+import base64
+import uuid
+from io import StringIO
+from unittest import mock
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
-from .models import Campaign, Donation
-from core.models import Category, Country
+from .models import (
+    Campaign, Donation, DonationDailyStat, DonorDailyStat, OwnerDailyStat, PlatformStats,
+    DonationIdempotencyKey, default_avatar, gravatar_hash,
+)
+from . import sample_data
+from .search import search_campaigns
+from core.models import Category, Country, OutboxEmail
 
 User = get_user_model()
 
@@ -193,3 +208,725 @@ class DonationOrderingTestCase(TestCase):
         image_url = self.campaign.image_url()
         self.assertIsInstance(image_url, str)
         self.assertTrue(len(image_url) > 0)
+
+
+class CampaignTestCase(TestCase):
+    """An owner, a category and a campaign of theirs, created once per class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='testpass123'
+        )
+        cls.category = Category.objects.create(name='Totals', slug='totals')
+        cls.campaign = cls.create_campaign()
+
+    @classmethod
+    def create_campaign(cls, **kwargs):
+        return Campaign.objects.create(**{
+            'title': 'Totals Campaign',
+            'description': 'Test Description',
+            'user': cls.user,
+            'category': cls.category,
+            'goal': 1000,
+            'location': 'Test Location',
+            'deadline': timezone.now().date() + timedelta(days=30),
+            'image': 'test.jpg',
+            **kwargs,
+        })
+
+    def donate(self, amount, approved=True):
+        return Donation.objects.create(
+            campaign=self.campaign,
+            fullname='Donor',
+            email='donor@example.com',
+            country='Test Country',
+            postal_code='12345',
+            donation=amount,
+            approved=approved,
+            date=timezone.now().date()
+        )
+
+
+class CampaignTotalsTestCase(CampaignTestCase):
+    def assertTotals(self, raised, donors, pending):
+        self.campaign.refresh_from_db()
+        self.assertEqual(
+            (self.campaign.raised_total, self.campaign.donor_count, self.campaign.pending_total),
+            (raised, donors, pending)
+        )
+
+    def test_totals_follow_inserts_approvals_and_deletes(self):
+        approved = self.donate(100)
+        pending = self.donate(40, approved=False)
+        self.assertTotals(100, 1, 40)
+
+        pending.approved = True
+        pending.save()
+        self.assertTotals(140, 2, 0)
+
+        approved.delete()
+        self.assertTotals(40, 1, 0)
+
+        Donation.objects.filter(campaign=self.campaign).delete()
+        self.assertTotals(0, 0, 0)
+
+    def test_campaign_edit_keeps_totals(self):
+        stale = Campaign.objects.get(pk=self.campaign.pk)
+        self.donate(250)
+
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertTotals(250, 1, 0)
+
+    def test_reading_progress_costs_no_queries(self):
+        self.donate(500)
+        campaign = Campaign.objects.get(pk=self.campaign.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(campaign.total_raised, 500)
+            self.assertEqual(campaign.total_donations_pending(), 0)
+
+    def test_reconcile_command_repairs_drift(self):
+        self.donate(100)
+        self.donate(30, approved=False)
+        Campaign.objects.filter(pk=self.campaign.pk).update(
+            raised_total=999, donor_count=7, pending_total=0
+        )
+
+        call_command('reconcile_campaign_totals', chunk_size=1, stdout=StringIO())
+        self.assertTotals(100, 1, 30)
+
+    def rollups(self):
+        today = timezone.now().date()
+        fields = ('amount', 'count', 'approved_amount', 'approved_count')
+        return [
+            model.objects.filter(day=today).values_list(*fields).first()
+            for model in (DonationDailyStat, OwnerDailyStat, DonorDailyStat)
+        ]
+
+    def test_rollups_follow_inserts_approvals_and_deletes(self):
+        approved = self.donate(100)
+        pending = self.donate(40, approved=False)
+        self.assertEqual(self.rollups(), [(140, 2, 100, 1)] * 3)
+
+        pending.approved = True
+        pending.save()
+        self.assertEqual(self.rollups(), [(140, 2, 140, 2)] * 3)
+
+        approved.delete()
+        self.assertEqual(self.rollups(), [(40, 1, 40, 1)] * 3)
+
+    def test_backfill_command_rebuilds_rollups(self):
+        self.donate(100)
+        self.donate(30, approved=False)
+        DonationDailyStat.objects.update(amount=999)
+        OwnerDailyStat.objects.all().delete()
+
+        call_command('backfill_daily_stats', window_days=1, stdout=StringIO())
+        self.assertEqual(self.rollups(), [(130, 2, 100, 1)] * 3)
+
+    def test_deleted_campaign_leaves_the_rollups(self):
+        self.donate(100)
+        self.donate(30, approved=False)
+        deleted = self.campaign
+        self.campaign = self.create_campaign(title='Other Campaign')
+        self.donate(50)
+
+        deleted.delete()
+        self.assertEqual(self.rollups(), [(50, 1, 50, 1)] * 3)
+
+        # The backfill agrees with the signals
+        call_command('backfill_daily_stats', window_days=1, stdout=StringIO())
+        self.assertEqual(self.rollups(), [(50, 1, 50, 1)] * 3)
+
+
+class DonationEmailHashTestCase(CampaignTestCase):
+    def test_email_hash_is_stored_with_the_donation(self):
+        donation = self.donate(10)
+        donation.refresh_from_db()
+        self.assertEqual(donation.email_hash, gravatar_hash(' Donor@Example.com '))
+
+        donation.email = 'other@example.com'
+        donation.save(update_fields=['email'])
+        donation.refresh_from_db()
+        self.assertEqual(donation.email_hash, gravatar_hash('other@example.com'))
+        self.assertIn(donation.email_hash, donation.avatar)
+
+        donation.anonymous = True
+        self.assertEqual(donation.avatar, default_avatar())
+
+
+class DonationEmailTestCase(CampaignTestCase):
+    def test_donating_queues_the_thank_you_email(self):
+        response = self.client.post(reverse('campaign:campaign-donation', args=[self.campaign.pk]), {
+            'fullname': 'Donor',
+            'email': 'donor@example.com',
+            'country': 'Test Country',
+            'postal_code': '12345',
+            'donation': 50,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Donation.objects.filter(campaign=self.campaign).exists())
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ['donor@example.com'])
+        self.assertIn('Totals Campaign', email.subject)
+
+
+class DonationIdempotencyTestCase(CampaignTestCase):
+    def test_replayed_donation_is_not_saved_twice(self):
+        url = reverse('campaign:campaign-donation', args=[self.campaign.pk])
+        self.assertIn('idempotency_key', self.client.get(url).content.decode())
+        data = {
+            'fullname': 'Donor',
+            'email': 'donor@example.com',
+            'country': 'Test Country',
+            'postal_code': '12345',
+            'donation': 50,
+            'idempotency_key': str(uuid.uuid4()),
+        }
+        first = self.client.post(url, data)
+        with self.assertNumQueries(1):
+            replay = self.client.post(url, data)
+        self.assertEqual(replay['Location'], first['Location'])
+        self.assertEqual(Donation.objects.filter(campaign=self.campaign).count(), 1)
+
+        # The key can't be replayed against another campaign
+        other = self.create_campaign(title='Other Campaign')
+        response = self.client.post(reverse('campaign:campaign-donation', args=[other.pk]), data)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Donation.objects.filter(campaign=other).exists())
+
+        # Once expired the key is forgotten and pruned
+        DonationIdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.client.post(url, data)
+        self.assertEqual(Donation.objects.filter(campaign=self.campaign).count(), 2)
+
+        DonationIdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        call_command('prune_idempotency_keys', stdout=StringIO())
+        self.assertEqual(DonationIdempotencyKey.objects.count(), 0)
+
+
+class AsyncDonationViewTestCase(CampaignTestCase):
+    async def test_donating_under_asgi(self):
+        # The ASGI handler awaits the async view and middleware directly
+        response = await self.async_client.post(reverse('campaign:campaign-donation', args=[self.campaign.pk]), {
+            'fullname': 'Donor',
+            'email': 'donor@example.com',
+            'country': 'Test Country',
+            'postal_code': '12345',
+            'donation': 50,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(await Donation.objects.filter(campaign=self.campaign).acount(), 1)
+        self.assertEqual(await OutboxEmail.objects.acount(), 1)
+
+        response = await self.async_client.post(reverse('campaign:campaign-donation', args=[self.campaign.pk]), {
+            'fullname': 'Donor',
+            'donation': 1,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+
+
+class CampaignCardCacheTestCase(CampaignTestCase):
+    def test_campaign_card_is_cached_per_version(self):
+        cache.clear()
+
+        def render():
+            campaign = Campaign.objects.get(pk=self.campaign.pk)
+            with self.assertNumQueries(0 if cached else 1):
+                return render_to_string('includes/campaign.html', {'campaign': campaign})
+
+        cached = False
+        self.assertIn('₹0', render())
+
+        # Unversioned writes are not seen, and the hit skips the user lookup.
+        Campaign.objects.filter(pk=self.campaign.pk).update(title='Sneaky')
+        cached = True
+        self.assertNotIn('Sneaky', render())
+
+        self.donate(120)
+        cached = False
+        html = render()
+        self.assertIn('₹120', html)
+        self.assertIn('Sneaky', html)
+
+        campaign = Campaign.objects.get(pk=self.campaign.pk)
+        campaign.title = 'Renamed'
+        campaign.save()
+        self.assertIn('Renamed', render())
+
+
+class PlatformStatsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='platform',
+            email='platform@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Platform', slug='platform')
+        # Seed the row the way the first page view does.
+        PlatformStats.load()
+
+    def create_campaign(self, **kwargs):
+        return Campaign.objects.create(
+            title='Platform Campaign',
+            description='Test Description',
+            user=self.user,
+            category=self.category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg',
+            **kwargs
+        )
+
+    def donate(self, campaign, amount, approved=True):
+        return Donation.objects.create(
+            campaign=campaign,
+            fullname='Donor',
+            email='donor@example.com',
+            country='Test Country',
+            postal_code='12345',
+            donation=amount,
+            approved=approved,
+            date=timezone.now().date()
+        )
+
+    def assertStats(self, **expected):
+        stats = PlatformStats.load()
+        self.assertEqual({field: getattr(stats, field) for field in expected}, expected)
+        actual = PlatformStats.compute()
+        self.assertEqual({field: getattr(stats, field) for field in actual}, actual)
+
+    def test_counters_follow_writes(self):
+        self.assertStats(members=1, campaigns=0, active_campaigns=0)
+
+        campaign = self.create_campaign()
+        other = self.create_campaign(is_active=True)
+        self.assertStats(campaigns=2, active_campaigns=1)
+
+        campaign.status = 'approved'
+        campaign.save()
+        self.assertStats(active_campaigns=2)
+
+        self.donate(campaign, 100)
+        pending = self.donate(campaign, 40, approved=False)
+        self.donate(other, 10)
+        self.assertStats(donations=2, raised=110, pending=40)
+
+        pending.approved = True
+        pending.save()
+        self.assertStats(donations=3, raised=150, pending=0)
+
+        campaign.delete()
+        self.assertStats(campaigns=1, active_campaigns=1, donations=1, raised=10)
+
+        self.category.delete()
+        User.objects.create_user(username='second', password='testpass123')
+        self.assertStats(members=2, campaigns=0, active_campaigns=0, donations=0, raised=0)
+
+    def test_repair_command_fixes_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        self.donate(self.create_campaign(), 100)
+        PlatformStats.objects.update(raised=5, members=0)
+
+        call_command('repair_platform_stats', dry_run=True, stdout=StringIO())
+        self.assertEqual(PlatformStats.load().raised, 5)
+
+        call_command('repair_platform_stats', stdout=StringIO())
+        self.assertStats(members=1, raised=100)
+
+
+class DonationImportTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='importer',
+            email='importer@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Import', slug='import')
+        self.campaign = Campaign.objects.create(
+            title='Import Campaign',
+            description='Test Description',
+            user=self.user,
+            category=self.category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+
+    def import_file(self, name, content, **options):
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from io import StringIO
+
+        stdout, stderr = StringIO(), StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            call_command('import_donations', path, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_import_updates_totals_and_reports_bad_rows(self):
+        header = 'campaign,fullname,email,country,postal_code,donation,date,approved\n'
+        rows = ''.join(
+            f'{self.campaign.pk},Donor {i},donor{i}@example.com,India,12345,10,2024-01-0{i % 3 + 1},true\n'
+            for i in range(5)
+        )
+        bad = (
+            f'{self.campaign.pk},Too Small,small@example.com,India,12345,1,2024-01-01,true\n'
+            'not-a-campaign,Lost,lost@example.com,India,12345,10,2024-01-01,true\n'
+            f'{self.campaign.pk},Pending,pending@example.com,India,12345,20,2024-01-01,false\n'
+        )
+        stdout, stderr = self.import_file('donations.csv', header + rows + bad, chunk_size=2)
+
+        self.assertIn('Imported 6 donations, skipped 2 invalid rows', stdout)
+        self.assertIn('Line 7: donation:', stderr)
+        self.assertIn('Line 8: campaign: unknown campaign', stderr)
+        self.campaign.refresh_from_db()
+        self.assertEqual(
+            (self.campaign.raised_total, self.campaign.donor_count, self.campaign.pending_total),
+            (50, 5, 20)
+        )
+        self.assertEqual(PlatformStats.load().raised, 50)
+        self.assertFalse(Donation.objects.filter(email_hash='').exists())
+
+    def test_approved_column_is_parsed_explicitly(self):
+        header = 'campaign,fullname,email,country,postal_code,donation,date,approved\n'
+        rows = ''.join(
+            f'{self.campaign.pk},Donor,donor@example.com,India,12345,10,2024-01-01,{approved}\n'
+            for approved in ('no', '0', 'False', 'Yes', '1', '', 'n')
+        )
+        stdout, stderr = self.import_file('donations.csv', header + rows)
+
+        self.assertIn('Imported 6 donations, skipped 1 invalid rows', stdout)
+        self.assertIn("Line 8: approved: expected true/false, yes/no or 1/0, got 'n'", stderr)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.raised_total, self.campaign.pending_total), (30, 30))
+
+    def test_jsonl_import(self):
+        import json
+
+        lines = [
+            json.dumps({
+                'campaign': self.campaign.pk.hex, 'fullname': 'Donor', 'email': 'd@example.com',
+                'country': 'India', 'postal_code': '1', 'donation': 15, 'date': '2024-02-01',
+            }),
+            '',
+            '{broken',
+        ]
+        stdout, stderr = self.import_file('donations.jsonl', '\n'.join(lines))
+
+        self.assertIn('Imported 1 donations, skipped 1 invalid rows', stdout)
+        self.assertIn('Line 3: not a JSON object', stderr)
+        self.assertTrue(Donation.objects.get().approved)
+
+
+class GenerateSampleDataTestCase(TestCase):
+    def generate(self, **options):
+        call_command('generate_sample_data', stdout=StringIO(), **options)
+
+    def test_generates_rows_and_their_totals(self):
+        self.generate(users=3, campaigns=6, donations=40, seed=7, workers=2, batch_size=15)
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Campaign.objects.count(), 6)
+        self.assertEqual(Donation.objects.count(), 40)
+        approved = Donation.objects.filter(approved=True)
+        raised = sum(approved.values_list('donation', flat=True))
+        self.assertEqual(sum(Campaign.objects.values_list('raised_total', flat=True)), raised)
+        self.assertEqual(
+            sum(DonationDailyStat.objects.values_list('approved_amount', flat=True)), raised
+        )
+        self.assertEqual(PlatformStats.load().donations, approved.count())
+
+        campaign = Campaign.objects.first()
+        self.assertIn(campaign, search_campaigns(Campaign.objects.all(), campaign.title))
+
+    def test_rows_depend_only_on_the_seed(self):
+        now = timezone.now()
+
+        def rows(seed):
+            sample_data.init_worker({
+                'seed': seed,
+                'now': now,
+                'country_ids': [1, 2],
+                'categories': [(1, 'Music'), (2, 'Film')],
+                'user_ids': [1, 2, 3],
+                'campaigns': [('a', now.date(), 1000), ('b', now.date(), 90000)],
+            })
+            return (
+                sample_data.user_rows((0, 0, 5)),
+                sample_data.campaign_rows((2, 10, 5)),
+                sample_data.donation_rows((3, 0, 20)),
+            )
+
+        self.assertEqual(rows(1), rows(1))
+        self.assertNotEqual(rows(1), rows(2))
+
+
+class CampaignStatsQuerySetTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='stats',
+            email='stats@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Stats', slug='stats')
+        for index in range(3):
+            campaign = Campaign.objects.create(
+                title=f'Stats Campaign {index}',
+                description='Test Description',
+                user=self.user,
+                category=self.category,
+                goal=200,
+                location='Test Location',
+                deadline=timezone.now().date() + timedelta(days=10),
+                image='test.jpg'
+            )
+            Donation.objects.create(
+                campaign=campaign,
+                fullname='Donor',
+                email='donor@example.com',
+                country='Test Country',
+                postal_code='12345',
+                donation=50 * (index + 1),
+                approved=True,
+                date=timezone.now().date()
+            )
+
+    def test_with_stats_annotations(self):
+        for live in (False, True):
+            campaigns = Campaign.objects.with_stats(live=live).order_by('title')
+            with self.assertNumQueries(1):
+                stats = [
+                    (c.total_raised, c.total_donors, c.progress_percentage, c.days_remaining())
+                    for c in campaigns
+                ]
+            self.assertEqual(stats, [
+                (50, 1, 25.0, 10),
+                (100, 1, 50.0, 10),
+                (150, 1, 75.0, 10),
+            ])
+
+    def test_campaign_list_query_count_is_flat(self):
+        from django.core.cache import cache
+        from django.test import Client
+        from django.urls import reverse
+
+        cache.clear()
+        client = Client()
+        # Paginator count, cached category navigation and the list itself;
+        # the cards add nothing on top.
+        with self.assertNumQueries(3):
+            response = client.get(reverse('campaign:campaign-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '75%')
+
+    def test_stats_loader_batches_campaigns_loaded_without_totals(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from core.templatetags.campaign_tags import progress_percentage, total_raised
+        from .loaders import CampaignStatsLoaderMiddleware
+
+        def view(request):
+            campaigns = list(
+                Campaign.objects.only('id', 'title', 'goal').order_by('title')
+            )
+            with self.assertNumQueries(1):
+                values = [(total_raised(c), progress_percentage(c)) for c in campaigns]
+            self.assertEqual(values, [(50, 25.0), (100, 50.0), (150, 75.0)])
+            return HttpResponse()
+
+        CampaignStatsLoaderMiddleware(view)(RequestFactory().get('/'))
+
+
+class CampaignSearchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='search',
+            email='search@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Environment', slug='environment')
+        self.reef = self.create_campaign('Ocean Reef Restoration', 'Replanting coral.')
+        self.school = self.create_campaign('Village School', 'Books and a trip to the ocean.')
+
+    def create_campaign(self, title, description):
+        return Campaign.objects.create(
+            title=title,
+            description=description,
+            user=self.user,
+            category=self.category,
+            goal=1000,
+            location='Chennai',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+
+    def search(self, text):
+        from .search import search_campaigns
+        return list(search_campaigns(Campaign.objects.all(), text))
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search('ocean'), [self.reef, self.school])
+        self.assertEqual(self.search('oce'), [self.reef, self.school])
+        self.assertEqual(self.search('coral'), [self.reef])
+        self.assertEqual(self.search('"!'), [])
+
+    def test_rebuild_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        call_command('rebuild_search_index', chunk_size=1, stdout=StringIO())
+        self.assertEqual(self.search('ocean'), [self.reef, self.school])
+
+    def test_index_follows_campaign_and_category_writes(self):
+        self.school.title = 'Village Library'
+        self.school.save()
+        self.assertEqual(self.search('library'), [self.school])
+
+        self.category.name = 'Wildlife'
+        self.category.save()
+        self.assertEqual(len(self.search('wildlife')), 2)
+
+        self.reef.delete()
+        self.assertEqual(self.search('ocean'), [self.school])
+
+    def test_list_view_search(self):
+        from django.urls import reverse
+
+        response = self.client.get(reverse('campaign:campaign-list'), {'q': 'chennai reef'})
+        self.assertEqual(list(response.context['campaigns']), [self.reef])
+
+
+class LoadMoreDonationsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='loadmore',
+            email='loadmore@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Load More', slug='load-more')
+        self.campaign = Campaign.objects.create(
+            title='Load More Campaign',
+            description='Test Description',
+            user=self.user,
+            category=self.category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+        today = timezone.now().date()
+        for index in range(25):
+            Donation.objects.create(
+                campaign=self.campaign,
+                fullname=f'Donor {index}',
+                email='donor@example.com',
+                country='Test Country',
+                postal_code='12345',
+                donation=10,
+                approved=True,
+                date=today - timedelta(days=index % 4)
+            )
+
+    def test_cursor_walks_every_donation_once(self):
+        from django.urls import reverse
+
+        url = reverse('campaign:load-more-donations', kwargs={'pk': self.campaign.id})
+        seen = 0
+        params = {'limit': 10}
+        while True:
+            with self.assertNumQueries(1):
+                data = self.client.get(url, params).json()
+            self.assertTrue(data['success'])
+            seen += data['html'].count('list-group-item')
+            if not data['has_more']:
+                break
+            params['cursor'] = data['next_cursor']
+        self.assertEqual(seen, 25)
+        self.assertNotIn('total_donations', data)
+
+        data = self.client.get(url, {'count': 1}).json()
+        self.assertEqual(data['total_donations'], 25)
+
+    def test_unchanged_campaign_is_not_modified(self):
+        from django.core.cache import cache
+        from django.urls import reverse
+
+        cache.clear()
+        for name in ('campaign:campaign-donation', 'campaign:campaign-detail'):
+            url = reverse(name, kwargs={'pk': self.campaign.id})
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.has_header('Last-Modified'))
+
+            with self.assertNumQueries(1 if name != 'campaign:campaign-detail' else 0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+        # "Days left" changes at midnight even when the campaign doesn't
+        response = self.client.get(url)
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=tomorrow):
+            cache.clear()
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+            self.assertEqual(
+                self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 200
+            )
+
+        etag = self.client.get(url)['ETag']
+        Donation.objects.first().delete()
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Logged-in pages are personalised and validate separately
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_invalid_cursor(self):
+        from django.urls import reverse
+
+        url = reverse('campaign:load-more-donations', kwargs={'pk': self.campaign.id})
+        # Garbage, then well-formed tokens of the wrong length, shape or types
+        for cursor in ['not-a-cursor', *(
+            base64.urlsafe_b64encode(payload.encode()).decode()
+            for payload in ('[1]', '{"a":1}', '["abc","x"]', '[{"d":"2024-01-01"},{"u":"zz"}]')
+        )]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+    async def test_detail_and_feed_under_asgi(self):
+        import uuid
+        from django.core.cache import cache
+        from django.urls import reverse
+
+        await cache.aclear()
+        url = reverse('campaign:campaign-detail', args=[self.campaign.pk])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['donations']), 10)
+        # Answered from the campaign's validators
+        response = await self.async_client.get(url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        url = reverse('campaign:load-more-donations', args=[self.campaign.pk])
+        data = (await self.async_client.get(url, {'limit': 20, 'count': 1})).json()
+        self.assertEqual(data['html'].count('list-group-item'), 20)
+        self.assertEqual(data['total_donations'], 25)
+
+        missing = reverse('campaign:campaign-detail', args=[uuid.uuid4()])
+        self.assertEqual((await self.async_client.get(missing)).status_code, 404)
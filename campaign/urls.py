@@ -1,13 +1,20 @@
 from django.urls import path
 
+from core.page_cache import cache_anonymous_page
 from .views import *
 
+# Donations bump the campaign's page version; the short TTL keeps time-based
+# bits like "days left" current.
+detail_page = cache_anonymous_page(
+    15, stale=60, namespaces=lambda request, pk: [f"campaign:{pk}"]
+)
+
 app_name = 'campaign'
 
 urlpatterns = [
     path('create', CampaignCreateView.as_view(), name='campaign-create'),
-    path('details/<uuid:pk>', CampaignDetailView.as_view(), name='campaign-detail'),
-    path('<uuid:pk>/donation', DonationView.as_view(), name='campaign-donation'),
+    path('details/<uuid:pk>', detail_page(campaign_conditional(CampaignDetailView.as_view())), name='campaign-detail'),
+    path('<uuid:pk>/donation', campaign_conditional(DonationView.as_view()), name='campaign-donation'),
     path('campaigns/', CampaignListView.as_view(), name='campaign-list'),
     path('<uuid:pk>/donations/load-more', LoadMoreDonationsView.as_view(), name='load-more-donations'),
 ]
@@ -1,23 +1,93 @@
+import functools
+import uuid
+from datetime import datetime, time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.utils import timezone
 from django.utils.timezone import now
-from django.db.models import Q, Sum
-from django.views.generic import CreateView, DetailView, ListView, View
+from django.views.generic import CreateView, ListView, View
 from django.utils.translation import gettext as _
 from django.core.exceptions import ValidationError
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
-from django.shortcuts import redirect, get_object_or_404
+from django.db import IntegrityError, transaction
+from django.shortcuts import redirect
 from django.template.loader import render_to_string
 
 from core.models import Country
+from core.outbox import queue_email
+from core.page_cache import has_pending_messages
+from core.pagination import cursor_values, decode_cursor, encode_cursor, keyset_filter
+from .search import search_campaigns
 from .forms import *
 
 
+DONATION_ORDERING = ['-date', '-id']
+
+
+def _campaign_validators(request, pk):
+    """
+    The ETag and Last-Modified of campaign ``pk`` for this visitor, read with
+    one query and remembered on the request. cache_version changes with every
+    campaign edit and donation write, and today's date changes "days left",
+    so together they validate everything rendered from the campaign.
+    """
+    if not hasattr(request, '_campaign_validators'):
+        row = None
+        # Only safe requests are answered with 304; don't spend a query on the others.
+        if request.method in ('GET', 'HEAD') and not has_pending_messages(request):
+            row = Campaign.objects.filter(pk=pk).values_list('cache_version', 'modified_at').first()
+        if row is None:
+            request._campaign_validators = (None, None)
+        else:
+            version, modified_at = row
+            # Keyed by date like the campaign card cache; pages are
+            # personalised for logged-in users, so they validate separately.
+            today = timezone.localdate()
+            midnight = timezone.make_aware(datetime.combine(today, time.min))
+            request._campaign_validators = (
+                f'{pk.hex}-{version}-{request.user.pk or 0}-{today:%Y%m%d}',
+                max(modified_at, midnight),
+            )
+    return request._campaign_validators
+
+
+_conditional = condition(
+    etag_func=lambda request, pk, **kwargs: _campaign_validators(request, pk)[0],
+    last_modified_func=lambda request, pk, **kwargs: _campaign_validators(request, pk)[1],
+)
+
+
+def campaign_conditional(view):
+    """Answer conditional requests for campaign ``pk`` from its cache_version."""
+    conditional = _conditional(view)
+    if not iscoroutinefunction(view):
+        return conditional
+
+    @functools.wraps(view)
+    async def wrapper(request, pk, **kwargs):
+        # condition() calls the validators synchronously; read them in a
+        # worker thread first so it finds them remembered on the request.
+        await sync_to_async(_campaign_validators)(request, pk)
+        return await conditional(request, pk=pk, **kwargs)
+
+    return wrapper
+
+
+async def _aget_or_404(queryset, **lookup):
+    """get_object_or_404() for async views."""
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.verbose_name} found matching the query")
+
+
 class CampaignListView(ListView):
     model = Campaign
     template_name = "campaigns/list.html"
@@ -25,17 +95,12 @@ class CampaignListView(ListView):
     paginate_by = 12  # Show 12 campaigns per page
 
     def get_queryset(self):
-        queryset = Campaign.objects.prefetch_related("user").order_by('-date')
+        queryset = Campaign.objects.with_stats().select_related("user").order_by('-date')
         
-        # Handle search
+        # Handle search, ranked by relevance
         query = self.request.GET.get('q')
         if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(location__icontains=query) |
-                Q(category__name__icontains=query)
-            )
+            queryset = search_campaigns(queryset, query)
         
         return queryset
 
@@ -87,60 +152,111 @@ class CampaignCreateView(CreateView):
     #     return kwargs
 
 
-class CampaignDetailView(DetailView):
-    model = Campaign
+class CampaignDetailView(View):
     template_name = "campaigns/details.html"
-    context_object_name = "campaign"
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        campaign = self.get_object()
-        
-        # Get donation statistics
-        donations = campaign.donation_set.filter(approved=True)
-        total_raised = donations.aggregate(Sum('donation'))['donation__sum'] or 0
-        total_donors = donations.count()
+
+    async def get(self, request, pk):
+        campaign = await _aget_or_404(Campaign.objects.all(), pk=pk)
+        # Rendered by the handler, in a worker thread under ASGI
+        return TemplateResponse(request, self.template_name, await self.get_context_data(campaign))
+
+    async def get_context_data(self, campaign):
+        # Donation statistics are stored on the campaign itself
+        total_raised = campaign.raised_total
+        total_donors = campaign.donor_count
         
         # Calculate progress percentage
         progress_percentage = (total_raised / campaign.goal * 100) if campaign.goal > 0 else 0
         
-        context.update({
+        # Get latest 10 donations, with id as tiebreaker
+        donations = [
+            donation async for donation in
+            campaign.donation_set.filter(approved=True).order_by(*DONATION_ORDERING)[:10]
+        ]
+
+        return {
+            'campaign': campaign,
+            'view': self,
             'total_raised': total_raised,
             'total_donors': total_donors,
             'progress_percentage': min(100, progress_percentage),  # Cap at 100%
-            'donations': donations.order_by('-date', '-id')[:10],  # Get latest 10 donations, with id as tiebreaker
+            'donations': donations,
+            # Cursor for the "load more" button to continue after the last donation shown
+            'donations_cursor': encode_cursor(cursor_values(donations[-1], DONATION_ORDERING)) if donations else '',
             'share_url': self.request.build_absolute_uri(),  # Full URL for sharing
-        })
-        return context
+        }
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class DonationView(CreateView):
-    model = Donation
+class DonationView(View):
     template_name = "campaigns/make-donation.html"
-    form_class = DonationForm
-    
-    def dispatch(self, request, *args, **kwargs):
-        # Get campaign and verify it exists and is active
-        self.campaign = get_object_or_404(
-            Campaign.objects.select_related('user'),
-            id=kwargs['pk'],
-        )
-        return super().dispatch(request, *args, **kwargs)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        
-        # Get donation statistics
-        donations = self.campaign.donation_set.filter(approved=True)
-        total_raised = donations.aggregate(Sum('donation'))['donation__sum'] or 0
-        total_donors = donations.count()
+    async def get(self, request, pk):
+        campaign = await self.get_campaign(pk)
+        form = DonationForm(initial=await self.get_initial())
+        return self.render_form(campaign, form)
+
+    async def post(self, request, pk):
+        # A replayed submission gets the original result with one indexed read
+        try:
+            key = uuid.UUID(request.POST.get('idempotency_key', ''))
+        except ValueError:
+            key = None
+        if key is not None:
+            previous = await DonationIdempotencyKey.objects.filter(key=key).values_list(
+                'campaign_id', 'created_at'
+            ).afirst()
+            if previous is not None:
+                campaign_id, created_at = previous
+                if created_at >= now() - IDEMPOTENCY_KEY_TTL:
+                    # A key only ever stands for a submission to its own campaign.
+                    if campaign_id != pk:
+                        return HttpResponseBadRequest()
+                    return self.donation_success(campaign_id)
+                # Expired but not pruned yet; this is a new submission.
+                await DonationIdempotencyKey.objects.filter(key=key).adelete()
+
+        campaign = await self.get_campaign(pk)
+        form = DonationForm(request.POST, request.FILES, initial=await self.get_initial())
+        if form.is_valid():
+            return await self.form_valid(campaign, form)
+        return self.form_invalid(campaign, form)
+
+    async def get_campaign(self, pk):
+        # Get campaign and verify it exists
+        return await _aget_or_404(Campaign.objects.select_related('user'), id=pk)
+
+    async def get_initial(self):
+        initial = {'idempotency_key': uuid.uuid4()}
+        user = await self.request.auser()
+        if user.is_authenticated:
+            # Pre-fill form with user data
+            country = None
+            if user.country_id is not None:
+                country = await Country.objects.filter(pk=user.country_id).values_list(
+                    'name', flat=True
+                ).afirst()
+            initial.update({
+                'fullname': user.get_full_name(),
+                'email': user.email,
+                'country': country,
+            })
+        return initial
+
+    def get_context_data(self, campaign, form):
+        # Donation statistics are stored on the campaign itself
+        donations = campaign.donation_set.filter(approved=True)
+        total_raised = campaign.raised_total
+        total_donors = campaign.donor_count
         
         # Calculate progress percentage
-        progress_percentage = (total_raised / self.campaign.goal * 100) if self.campaign.goal > 0 else 0
+        progress_percentage = (total_raised / campaign.goal * 100) if campaign.goal > 0 else 0
 
-        context.update({
-            'campaign': self.campaign,
+        # The querysets are evaluated while the template renders, in a worker thread.
+        return {
+            'form': form,
+            'view': self,
+            'campaign': campaign,
             'countries': Country.objects.all(),
             'total_raised': total_raised,
             'total_donors': total_donors,
@@ -148,14 +264,16 @@ class DonationView(CreateView):
             'min_donation': 5,  # Minimum donation amount
             'recent_donations': donations.order_by('-date', '-id')[:5],
             "percentage": int(progress_percentage),
-        })
-        return context
+        }
 
-    def form_valid(self, form):
+    def render_form(self, campaign, form):
+        return TemplateResponse(self.request, self.template_name, self.get_context_data(campaign, form))
+
+    async def form_valid(self, campaign, form):
         donation = form.save(commit=False)
         
         # Set additional fields
-        donation.campaign = self.campaign
+        donation.campaign = campaign
         donation.date = now().date()  # Use date() to get only the date part
         donation.approved = True
         
@@ -164,86 +282,94 @@ class DonationView(CreateView):
         # Validate minimum donation
         if donation.donation < 5:
             messages.error(self.request, 'Minimum donation amount is ₹5')
-            return self.form_invalid(form)
-            
-        donation.save()
-        # Send a thank-you email (best-effort)
+            return self.form_invalid(campaign, form)
+
+        # Transactions are not available to async code; the donation, its
+        # key and its email commit together in a worker thread.
+        await sync_to_async(self.save_donation)(donation, form.cleaned_data.get('idempotency_key'))
+        return self.donation_success(campaign.id)
+
+    def save_donation(self, donation, key):
         try:
-            subject = 'Thank you for your donation to %s' % self.campaign.title
-            message = (
-                'Hi %s,\n\n'
-                'Thank you for donating ₹%s to %s. Your support means a lot!\n\n'
-                'Regards,\nBetterTogether'
-            ) % (donation.fullname, donation.donation, self.campaign.title)
-            from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None) or 'no-reply@bettertogether.local'
-            send_mail(subject, message, from_email, [donation.email], fail_silently=True)
-        except Exception:
-            pass
+            with transaction.atomic():
+                donation.save()
+                if key is not None:
+                    DonationIdempotencyKey.objects.create(
+                        key=key, donation=donation, campaign=donation.campaign
+                    )
+                # Queued with the donation and sent by the send_outbox_emails worker
+                queue_email(
+                    'Thank you for your donation to %s' % donation.campaign.title,
+                    (
+                        'Hi %s,\n\n'
+                        'Thank you for donating ₹%s to %s. Your support means a lot!\n\n'
+                        'Regards,\nBetterTogether'
+                    ) % (donation.fullname, donation.donation, donation.campaign.title),
+                    [donation.email],
+                )
+        except IntegrityError:
+            # A concurrent replay of this submission committed first.
+            if key is None or not DonationIdempotencyKey.objects.filter(
+                key=key, campaign_id=donation.campaign_id
+            ).exists():
+                raise
 
+    def donation_success(self, campaign_id):
         # Redirect with a query param to trigger success popup reliably
-        return redirect(f"{reverse_lazy('campaign:campaign-detail', kwargs={'pk': self.campaign.id})}?donation=success")
+        return redirect(f"{reverse_lazy('campaign:campaign-detail', kwargs={'pk': campaign_id})}?donation=success")
 
-    def form_invalid(self, form):
+    def form_invalid(self, campaign, form):
         messages.error(
             self.request, 
             'Please correct the errors below.'
         )
-        return super().form_invalid(form)
-
-    def get_form_kwargs(self):
-        kwargs = super().get_form_kwargs()
-        if self.request.user.is_authenticated:
-            # Pre-fill form with user data
-            kwargs['initial'] = {
-                'fullname': self.request.user.get_full_name(),
-                'email': self.request.user.email,
-                'country': self.request.user.country.name if hasattr(self.request.user, 'country') and hasattr(self.request.user.country, 'name') else None
-            }
-        return kwargs
+        return self.render_form(campaign, form)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
 class LoadMoreDonationsView(View):
-    """AJAX view to load more donations for a campaign"""
-    
-    def get(self, request, pk):
+    """AJAX view to load more donations for a campaign, paginated by cursor"""
+
+    max_limit = 50
+
+    async def get(self, request, pk):
         try:
-            campaign = get_object_or_404(Campaign, id=pk)
-            offset = int(request.GET.get('offset', 0))
-            limit = int(request.GET.get('limit', 10))
-            
-            # Get donations with offset and limit
-            donations = campaign.donation_set.filter(
-                approved=True
-            ).order_by('-date', '-id')[offset:offset + limit]
-            
+            limit = max(1, min(int(request.GET.get('limit', 10)), self.max_limit))
+            donations = Donation.objects.filter(
+                campaign_id=pk, approved=True
+            ).order_by(*DONATION_ORDERING)
+
+            # Seek past the last donation the client has seen
+            cursor = request.GET.get('cursor')
+            if cursor:
+                donations = donations.filter(keyset_filter(
+                    DONATION_ORDERING, decode_cursor(cursor, Donation, DONATION_ORDERING)
+                ))
+
+            # Fetch one extra row to know whether another page follows
+            donations = [donation async for donation in donations[:limit + 1]]
+            has_more = len(donations) > limit
+            donations = donations[:limit]
+
             # Render the donation items as HTML
             donation_html = render_to_string('campaigns/partials/donation_item.html', {
                 'donations': donations
             })
-            
-            # Check if there are more donations
-            total_donations = campaign.donation_set.filter(approved=True).count()
-            has_more = (offset + limit) < total_donations
-            
-            return JsonResponse({
+
+            data = {
                 'success': True,
                 'html': donation_html,
                 'has_more': has_more,
-                'next_offset': offset + limit,
-                'total_donations': total_donations,
-                'debug': {
-                    'offset': offset,
-                    'limit': limit,
-                    'donations_count': donations.count(),
-                    'total_donations': total_donations
-                }
-            })
-            
-        except Exception as e:
-            import traceback
+                'next_cursor': encode_cursor(cursor_values(donations[-1], DONATION_ORDERING)) if has_more else None,
+            }
+            if request.GET.get('count'):
+                # Approved donations are counted on the campaign as donors
+                campaign = await _aget_or_404(Campaign.objects.only('donor_count'), id=pk)
+                data['total_donations'] = campaign.donor_count
+            return JsonResponse(data)
+
+        except (ValueError, ValidationError) as e:
             return JsonResponse({
                 'success': False,
                 'error': str(e),
-                'traceback': traceback.format_exc()
-            })
+            }, status=400)
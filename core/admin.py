@@ -1,11 +1,17 @@
 from django.contrib import admin
 
-from .models import Category, Country
+from .models import Category, Country, OutboxEmail
 
 
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "slug", "image")
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+
+
 admin.site.register(Category, CategoryAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
 admin.site.register(Country)
@@ -1,6 +1,8 @@
-from core.models import Category
+from django.utils.functional import SimpleLazyObject
+
+from core.navigation import category_navigation
 
 
 def categories(request):
-    cats = Category.objects.prefetch_related("campaign_set").all()[:5]
-    return {'categories': cats}
+    # Lazy so responses that never render the navigation never load it.
+    return {'categories': SimpleLazyObject(lambda: category_navigation()[:5])}
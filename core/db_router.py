@@ -0,0 +1,157 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary (``default``). Reads go to one of the
+aliases in DATABASE_REPLICAS only inside read_from_replicas(). ReplicaMiddleware
+enters that block for GET/HEAD requests to the URL names listed in
+DATABASE_REPLICA_VIEWS. Code can also enter it directly, or pin a single
+queryset with ``.using(replica())``. Data stored in shared caches is read
+inside read_from_primary(), so a lagging replica is never cached under a
+freshly bumped version.
+
+Even inside the block, these reads stay on the primary:
+- when no replica is configured
+- inside a transaction on the primary
+- once the current request has written anything
+- session data
+- requests from a client that wrote within the last
+  DATABASE_REPLICA_PIN_SECONDS, tracked with a cookie, so clients see their
+  own writes despite replication lag
+"""
+import random
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+PIN_COOKIE = "primary_pin"
+SAFE_METHODS = ("GET", "HEAD")
+
+_reading_replicas = ContextVar("reading_replicas", default=False)
+_wrote = ContextVar("wrote_primary", default=False)
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def replica():
+    """Alias of a replica to read from, or the primary if there is none."""
+    aliases = replicas()
+    return random.choice(aliases) if aliases else PRIMARY
+
+
+@contextmanager
+def read_from_replicas():
+    """Read from replicas until the block ends or writes."""
+    reading = _reading_replicas.set(True)
+    wrote = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _wrote.reset(wrote)
+        _reading_replicas.reset(reading)
+
+
+@contextmanager
+def read_from_primary():
+    """Read from the primary until the block ends, even inside read_from_replicas()."""
+    reading = _reading_replicas.set(False)
+    try:
+        yield
+    finally:
+        _reading_replicas.reset(reading)
+
+
+class PrimaryReplicaRouter:
+    # Apps whose rows a client must always read fresh
+    primary_apps = {"sessions"}
+
+    def db_for_read(self, model, **hints):
+        if not _reading_replicas.get() or _wrote.get():
+            return PRIMARY
+        if model._meta.app_label in self.primary_apps:
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return replica()
+
+    def db_for_write(self, model, **hints):
+        # Reads after a write in the same request see it.
+        _wrote.set(True)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *replicas()}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and are never migrated directly.
+        return db == PRIMARY
+
+
+class ReplicaMiddleware:
+    """Route the reads of the configured views to replicas and pin writers to the primary."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # process_view may switch reads to replicas; both switches end with the request.
+        reading, wrote = _reading_replicas.set(False), _wrote.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _wrote.reset(wrote)
+            _reading_replicas.reset(reading)
+        return self.pin_writer(request, response)
+
+    async def __acall__(self, request):
+        reading, wrote = _reading_replicas.set(False), _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _wrote.reset(wrote)
+            _reading_replicas.reset(reading)
+        return self.pin_writer(request, response)
+
+    def pin_writer(self, request, response):
+        if request.method not in SAFE_METHODS and replicas():
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Under ASGI this runs in a worker thread; asgiref copies the
+        # context variable back to the request's context.
+        if (
+            request.method in SAFE_METHODS
+            and request.resolver_match.view_name in settings.DATABASE_REPLICA_VIEWS
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            _reading_replicas.set(True)
+
+
+def copy_sqlite_database(source, target):
+    """Copy a consistent snapshot of the SQLite file ``source`` over ``target``."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
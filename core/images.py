@@ -0,0 +1,165 @@
+"""
+Resized variants of uploaded images.
+
+Every image gets ``thumb``, ``card`` and ``hero`` renditions in WebP and
+JPEG, stored next to the original as ``<name>.<variant>.<ext>`` (e.g.
+``campaigns/cover.card.webp``). Models using ImageVariantsMixin remember
+which upload their variants were made from and how wide the ones that keep
+its aspect ratio came out, so a srcset only ever points at files that exist
+and describes them truthfully, and templates fall back to the original until
+they do. The square ``thumb`` crop never stands in for the original; it has
+its own srcset for square slots such as the category icons.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import models
+from PIL import Image, ImageOps
+
+# name: (width, height); a height crops to that box, None keeps the aspect ratio.
+VARIANTS = {
+    "thumb": (100, 100),
+    "card": (600, None),
+    "hero": (1200, None),
+}
+FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+QUALITY = 80
+
+
+def variant_name(name, variant, ext):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{variant}.{ext}"
+
+
+def _resize(image, width, height):
+    if height is not None:
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+    resized = image.copy()
+    # thumbnail() never upscales, so small uploads keep their own size.
+    resized.thumbnail((width, image.height), Image.LANCZOS)
+    return resized
+
+
+def srcset_widths(sizes):
+    """The widths, from generate_variants() ``sizes``, of the variants a srcset can offer."""
+    return {variant: sizes[variant][0] for variant, (_, height) in VARIANTS.items() if height is None}
+
+
+def delete_variants(storage, name):
+    for variant in VARIANTS:
+        for ext in FORMATS:
+            storage.delete(variant_name(name, variant, ext))
+
+
+def generate_variants(field_file, force=False):
+    """
+    Write every variant of ``field_file`` next to it in its storage and
+    return the (width, height) of each. Existing variants are kept unless
+    ``force``. Raises OSError if the original is missing or not an image.
+    """
+    storage = field_file.storage
+    with field_file.open("rb") as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    sizes = {}
+    for variant, (width, height) in VARIANTS.items():
+        resized = None
+        for ext, pil_format in FORMATS.items():
+            name = variant_name(field_file.name, variant, ext)
+            if storage.exists(name):
+                if not force:
+                    if variant not in sizes:
+                        with storage.open(name) as existing:
+                            sizes[variant] = Image.open(existing).size
+                    continue
+                storage.delete(name)
+            if resized is None:
+                resized = _resize(image, width, height)
+                sizes[variant] = resized.size
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, quality=QUALITY, optimize=True)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return sizes
+
+
+class ImageVariantsMixin(models.Model):
+    """Responsive ``srcset`` support for a model with an ``image`` field."""
+
+    image_variants = models.CharField(max_length=100, blank=True, editable=False)
+    image_variant_widths = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def has_image_variants(self):
+        return (
+            bool(self.image) and self.image_variants == self.image.name
+            and bool(self.image_variant_widths)
+        )
+
+    def srcset(self, ext="jpg"):
+        if not self.has_image_variants():
+            return ""
+        storage = self.image.storage
+        candidates = {}
+        # Small uploads aren't upscaled, so variants can share a width;
+        # offer the smallest file for each.
+        for variant, width in self.image_variant_widths.items():
+            candidates.setdefault(width, variant_name(self.image.name, variant, ext))
+        return ", ".join(f"{storage.url(name)} {width}w" for width, name in candidates.items())
+
+    @property
+    def srcset_jpeg(self):
+        return self.srcset("jpg")
+
+    @property
+    def srcset_webp(self):
+        return self.srcset("webp")
+
+    def square_srcset(self, ext="jpg"):
+        """The ``thumb`` crop, for images shown in a square box."""
+        if not self.has_image_variants():
+            return ""
+        width = VARIANTS["thumb"][0]
+        return f"{self.image.storage.url(variant_name(self.image.name, 'thumb', ext))} {width}w"
+
+    @property
+    def square_srcset_jpeg(self):
+        return self.square_srcset("jpg")
+
+    @property
+    def square_srcset_webp(self):
+        return self.square_srcset("webp")
+
+    def update_image_variants(self, force=False):
+        """
+        Generate variants for the current upload unless it has them, deleting
+        those of a replaced upload; return whether it generated any.
+        """
+        if self.image_variants and self.image_variants != self.image.name:
+            self.delete_image_variants()
+            self.record_image_variants("", {})
+        if not self.image or (self.has_image_variants() and not force):
+            return False
+        try:
+            sizes = generate_variants(self.image, force=force)
+        except OSError:
+            return False
+        self.record_image_variants(self.image.name, srcset_widths(sizes))
+        return True
+
+    def record_image_variants(self, name, widths):
+        self.image_variants, self.image_variant_widths = name, widths
+        type(self)._base_manager.filter(pk=self.pk).update(
+            image_variants=name, image_variant_widths=widths
+        )
+
+    def delete_image_variants(self):
+        """Delete the variant files last recorded, unless another row uses the same upload."""
+        name = self.image_variants
+        if name and not type(self)._base_manager.filter(image=name).exclude(pk=self.pk).exists():
+            delete_variants(self.image.storage, name)
@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from campaign.models import Campaign
+from core.images import generate_variants, srcset_widths
+from core.models import Category
+from core.navigation import invalidate_category_navigation
+
+
+class Command(BaseCommand):
+    help = 'Generate the responsive image variants of existing campaign and category images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Number of images to process in parallel')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate variants that already exist')
+
+    def handle(self, *args, **options):
+        force = options['force']
+
+        def generate(obj):
+            try:
+                return obj, generate_variants(obj.image, force=force), None
+            except OSError as e:
+                return obj, None, e
+
+        for model in (Campaign, Category):
+            objects = [
+                obj for obj in model.objects.exclude(image='')
+                .only('pk', 'image', 'image_variants', 'image_variant_widths')
+                if force or not obj.has_image_variants()
+            ]
+            done = 0
+            # Pillow releases the GIL while decoding, resizing and encoding,
+            # so threads keep every core busy without per-process setup.
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                for obj, sizes, error in pool.map(generate, objects):
+                    if error is not None:
+                        self.stderr.write(f"{model.__name__} {obj.pk}: {error}")
+                        continue
+                    model.objects.filter(pk=obj.pk).update(
+                        image_variants=obj.image.name, image_variant_widths=srcset_widths(sizes)
+                    )
+                    done += 1
+            self.stdout.write(f"{model.__name__}: {done} of {len(objects)} images processed")
+
+        invalidate_category_navigation()
+        self.stdout.write(self.style.SUCCESS('Image variants generated'))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Send the emails queued in the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Number of emails to send over one connection')
+        parser.add_argument('--max-attempts', type=int, default=5,
+                            help='Give up on an email after this many failed attempts')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling the outbox instead of exiting once it is drained')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to sleep between polls when the outbox is empty')
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        while True:
+            counts = send_pending(options['batch_size'], options['max_attempts'])
+            if any(counts):
+                totals = [total + count for total, count in zip(totals, counts)]
+                self.stdout.write("Sent {}, retrying {}, failed {}".format(*counts))
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            "Outbox drained: {} sent, {} to retry, {} failed".format(*totals)
+        ))
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.db_router import copy_sqlite_database
+
+SQLITE_ENGINE = 'django.db.backends.sqlite3'
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the replica files (local stand-in for replication)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep copying instead of exiting after one pass')
+        parser.add_argument('--interval', type=float, default=2,
+                            help='Seconds between copies with --loop')
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        replicas = [settings.DATABASES[alias] for alias in settings.DATABASE_REPLICAS]
+        if not replicas:
+            raise CommandError('No replicas configured; set SQLITE_REPLICA_PATHS')
+        if any(db['ENGINE'] != SQLITE_ENGINE for db in (primary, *replicas)):
+            raise CommandError('Only SQLite primaries and replicas can be synced by copying')
+
+        while True:
+            for replica in replicas:
+                copy_sqlite_database(primary['NAME'], replica['NAME'])
+            self.stdout.write(f"Copied {primary['NAME']} to {len(replicas)} replicas")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
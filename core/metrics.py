@@ -0,0 +1,245 @@
+"""
+Per-view request metrics in the Prometheus text format.
+
+MetricsMiddleware records, per resolved URL name, a latency histogram, the
+number of database queries and the time spent in them, and the response
+size. Samples are aggregated in process under a lock. When METRICS_DIR is
+set, every worker process also writes its totals to its own file in that
+directory at most every METRICS_FLUSH_INTERVAL seconds, and the /metrics
+endpoint sums all the files so any worker can answer for the whole
+deployment. The directory should be emptied when the server (re)starts.
+"""
+import atexit
+import ipaddress
+import json
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds of the latency histogram, in seconds (Prometheus defaults).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNRESOLVED = "<unresolved>"
+
+
+def _empty():
+    return {
+        "count": 0,
+        "latency_sum": 0.0,
+        "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+        "queries": 0,
+        "db_seconds": 0.0,
+        "response_bytes": 0,
+    }
+
+
+class MetricsRegistry:
+    """Request totals of the current process, keyed by view name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._last_flush = 0.0
+        # Unique for the lifetime of this process, even if its pid is reused.
+        self._file_name = f"{os.getpid()}-{time.time_ns()}.json"
+
+    def observe(self, view, seconds, queries, db_seconds, response_bytes):
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = _empty()
+            stats["count"] += 1
+            stats["latency_sum"] += seconds
+            stats["buckets"][bucket] += 1
+            stats["queries"] += queries
+            stats["db_seconds"] += db_seconds
+            stats["response_bytes"] += response_bytes
+
+    def snapshot(self):
+        with self._lock:
+            return {view: {**stats, "buckets": list(stats["buckets"])} for view, stats in self._views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def flush(self, force=False):
+        """Write this process' totals to METRICS_DIR, if configured and due."""
+        directory = getattr(settings, "METRICS_DIR", "")
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+            return
+        self._last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        # Write then rename so readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, os.path.join(directory, self._file_name))
+
+    def collect(self):
+        """Totals of every worker when METRICS_DIR is set, else of this process."""
+        directory = getattr(settings, "METRICS_DIR", "")
+        if not directory:
+            return self.snapshot()
+        self.flush(force=True)
+        merged = {}
+        for name in os.listdir(directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    views = json.load(f)
+            except (OSError, ValueError):
+                # Vanished or unreadable; skip rather than fail the scrape.
+                continue
+            for view, stats in views.items():
+                total = merged.setdefault(view, _empty())
+                for field, value in stats.items():
+                    if field == "buckets":
+                        total[field] = [a + b for a, b in zip(total[field], value)]
+                    else:
+                        total[field] += value
+        return merged
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush, force=True)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(views):
+    """Format collected totals in the Prometheus text exposition format."""
+    lines = [
+        "# HELP django_request_latency_seconds Time to respond, per view.",
+        "# TYPE django_request_latency_seconds histogram",
+    ]
+    for view, stats in sorted(views.items()):
+        label = f'view="{_label(view)}"'
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), stats["buckets"]):
+            cumulative += count
+            lines.append(f'django_request_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f"django_request_latency_seconds_sum{{{label}}} {stats['latency_sum']}")
+        lines.append(f"django_request_latency_seconds_count{{{label}}} {stats['count']}")
+
+    for name, field, help_text in (
+        ("django_request_db_queries_total", "queries", "Database queries run, per view."),
+        ("django_request_db_seconds_total", "db_seconds", "Time spent in database queries, per view."),
+        ("django_response_bytes_total", "response_bytes", "Response body bytes sent, per view."),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for view, stats in sorted(views.items()):
+            lines.append(f'{name}{{view="{_label(view)}"}} {stats[field]}')
+    return "\n".join(lines) + "\n"
+
+
+def is_internal(request):
+    """Whether the client address is in METRICS_ALLOWED_IPS (addresses or networks)."""
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    for allowed in getattr(settings, "METRICS_ALLOWED_IPS", settings.INTERNAL_IPS):
+        if address in ipaddress.ip_network(allowed, strict=False):
+            return True
+    return False
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and their duration."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+_request_timer = ContextVar("request_query_timer", default=None)
+
+
+def time_request_queries(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the timer of the request being handled."""
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection):
+    """
+    Time ``connection``'s queries for MetricsMiddleware. Installed once per
+    connection rather than per request: under ASGI the ORM runs in a worker
+    thread shared by every request, so the timer is found through the
+    request's context instead.
+    """
+    if time_request_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_request_queries)
+
+
+class MetricsMiddleware:
+    """Record latency, query count, DB time and response size per URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+        timer = QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.observe(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.observe(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def observe(self, request, response, elapsed, timer):
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match._func_path) if match else UNRESOLVED
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(view, elapsed, timer.queries, timer.seconds, size)
+        registry.flush()
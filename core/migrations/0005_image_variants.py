@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_category_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='image_variants',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.10 on 2026-10-17 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='image_variant_widths',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
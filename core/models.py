@@ -1,5 +1,8 @@
 import os
 from django.db import models
+from django.utils import timezone
+
+from core.images import ImageVariantsMixin
 
 
 class Country(models.Model):
@@ -10,7 +13,7 @@ class Country(models.Model):
         return self.name
 
 
-class Category(models.Model):
+class Category(ImageVariantsMixin, models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.CharField(max_length=100, unique=True)
     image = models.ImageField(upload_to='categories', default="default.png")
@@ -28,3 +31,34 @@ class Category(models.Model):
                 return "/media/categories/default.png"
         except (ValueError, AttributeError):
             return "/media/categories/default.png"
+
+
+class OutboxStatusChoices(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class OutboxEmail(models.Model):
+    """An email queued in the transaction that caused it; see core.outbox."""
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=10,
+        choices=OutboxStatusChoices.choices,
+        default=OutboxStatusChoices.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
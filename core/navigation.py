@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from core.db_router import read_from_primary
+from core.models import Category
+
+CATEGORY_NAV_VERSION_KEY = "category-nav:version"
+CATEGORY_NAV_TIMEOUT = 60 * 60
+
+
+def category_navigation():
+    """
+    Return every category annotated with ``campaign_count``, cached under the
+    current navigation version so writes only need to bump the version.
+    Built from the primary: a replica may not have the write yet.
+    """
+    version = cache.get_or_set(CATEGORY_NAV_VERSION_KEY, 1, timeout=None)
+    key = f"category-nav:{version}"
+    categories = cache.get(key)
+    if categories is None:
+        with read_from_primary():
+            categories = list(
+                Category.objects.annotate(campaign_count=Count("campaign")).order_by("id")
+            )
+        cache.set(key, categories, CATEGORY_NAV_TIMEOUT)
+    return categories
+
+
+def invalidate_category_navigation():
+    """Bump the navigation version once the transaction commits."""
+
+    def bump():
+        try:
+            cache.incr(CATEGORY_NAV_VERSION_KEY)
+        except ValueError:
+            cache.set(CATEGORY_NAV_VERSION_KEY, 1, timeout=None)
+
+    # Bumped earlier, a concurrent request could cache uncommitted
+    # categories under the new version.
+    transaction.on_commit(bump)
@@ -0,0 +1,127 @@
+"""
+Transactional email outbox.
+
+Views queue mail with queue_email() inside the transaction that makes it
+necessary, so an email exists if and only if its cause was committed. The
+``send_outbox_emails`` command drains the queue in batches over a single
+backend connection, outside any transaction, retrying failures with
+exponential backoff.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import OutboxEmail, OutboxStatusChoices
+
+DEFAULT_FROM_EMAIL = "no-reply@bettertogether.local"
+RETRY_DELAY = timedelta(minutes=1)
+MAX_RETRY_DELAY = timedelta(hours=1)
+# How long a claimed email is left to its worker before others may retry it
+SEND_TIMEOUT = timedelta(minutes=10)
+
+
+def queue_email(subject, body, to, from_email=None):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=list(to),
+        from_email=from_email or getattr(settings, "DEFAULT_FROM_EMAIL", None) or DEFAULT_FROM_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    """Wait 1, 2, 4, ... minutes after each failed attempt, up to an hour."""
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def claim_due(batch_size):
+    """
+    Claim up to ``batch_size`` due emails and return them.
+
+    A claim counts the attempt and moves next_attempt_at past SEND_TIMEOUT,
+    so other workers skip the rows while they are being sent, and a worker
+    that dies mid-batch only delays them. Each row is claimed with a
+    conditional UPDATE, so two workers never claim the same row even where
+    SELECT ... FOR UPDATE is a no-op (SQLite).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxStatusChoices.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        claimed = []
+        for email in due:
+            lease = now + SEND_TIMEOUT
+            if OutboxEmail.objects.filter(
+                pk=email.pk, attempts=email.attempts, next_attempt_at=email.next_attempt_at
+            ).update(attempts=email.attempts + 1, next_attempt_at=lease):
+                email.attempts += 1
+                email.next_attempt_at = lease
+                claimed.append(email)
+    return claimed
+
+
+def send_pending(batch_size=50, max_attempts=5):
+    """
+    Send one batch of due emails and return ``(sent, retrying, failed)``.
+
+    The batch is claimed and committed first, sent over one backend
+    connection with no transaction open, and the outcome is recorded in a
+    second short transaction. Slow SMTP never holds a database lock, so
+    several workers can drain the outbox side by side without sending
+    anything twice.
+    """
+    sent = retrying = failed = 0
+    batch = claim_due(batch_size)
+    if not batch:
+        return sent, retrying, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        opened, error = False, e
+    else:
+        opened, error = True, None
+
+    try:
+        for email in batch:
+            if opened:
+                try:
+                    EmailMessage(
+                        email.subject, email.body, email.from_email, email.to,
+                        connection=connection,
+                    ).send()
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+
+            if error is None:
+                email.status = OutboxStatusChoices.SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                sent += 1
+            elif email.attempts >= max_attempts:
+                email.status = OutboxStatusChoices.FAILED
+                email.last_error = repr(error)
+                failed += 1
+            else:
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                email.last_error = repr(error)
+                retrying += 1
+    finally:
+        if opened:
+            connection.close()
+        # Rows left unprocessed by an unexpected error keep their claim and
+        # are retried once it expires.
+        with transaction.atomic():
+            OutboxEmail.objects.bulk_update(
+                batch, ["status", "next_attempt_at", "last_error", "sent_at"]
+            )
+    return sent, retrying, failed
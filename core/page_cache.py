@@ -0,0 +1,166 @@
+"""
+Full-page cache for anonymous visitors.
+
+Pages are cached per host, path and query string, and their key includes
+the current version of every namespace the page depends on (``site`` for
+the navigation every page shows, ``listing`` for campaign listings,
+``campaign:<id>`` for a detail page...). Writes bump those versions through
+bump_page_versions(), which orphans exactly the affected pages; orphaned
+entries simply expire.
+
+An entry is fresh for ``timeout`` seconds and may then be served stale for
+``stale`` more while a single request, holding a short lock, re-renders it.
+Authenticated users, pending flash messages and non-GET requests bypass
+the cache. Hits answer If-None-Match/If-Modified-Since from the ETag and
+Last-Modified stored with the page.
+"""
+import functools
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+LOCK_TIMEOUT = 30
+
+
+def _version_key(namespace):
+    return f"page-version:{namespace}"
+
+
+def bump_page_versions(*namespaces):
+    """Invalidate the pages depending on ``namespaces`` once the transaction commits."""
+
+    def bump():
+        for namespace in namespaces:
+            key = _version_key(namespace)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Not set yet; the first read initializes it.
+                pass
+
+    transaction.on_commit(bump)
+
+
+def _page_key(request, namespaces):
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Start (or restart, after an eviction) from a value no earlier
+        # page can have been keyed by.
+        for key in missing:
+            cache.add(key, int(time.time() * 1000), None)
+        versions.update(cache.get_many(missing))
+    parts = [request.get_host(), request.get_full_path()]
+    parts += [f"{namespace}={versions.get(key)}" for namespace, key in zip(namespaces, keys)]
+    return "page:" + hashlib.md5("\n".join(parts).encode()).hexdigest()
+
+
+def has_pending_messages(request):
+    """Whether the next page rendered for ``request`` will show flash messages."""
+    if request.COOKIES.get(getattr(settings, "MESSAGE_COOKIE_NAME", "messages")):
+        return True
+    return bool(hasattr(request, "session") and request.session.get("_messages"))
+
+
+def _bypass(request):
+    if request.method not in ("GET", "HEAD"):
+        return True
+    if request.user.is_authenticated:
+        return True
+    # Flash messages are rendered once, so such pages must not be shared.
+    return has_pending_messages(request)
+
+
+def _lookup(request, namespaces, kwargs):
+    """
+    Return ``(key, response)``: a cached ``response`` to serve, or the ``key``
+    to store the view's response under (None when the request bypasses the
+    cache).
+    """
+    if _bypass(request):
+        return None, None
+
+    key = _page_key(request, ("site", *namespaces(request, **kwargs)))
+    entry = cache.get(key)
+    if entry is not None:
+        fresh_until, response = entry
+        # Serve stale unless this request wins the lock to re-render.
+        if time.time() < fresh_until or not cache.add(f"{key}:lock", 1, LOCK_TIMEOUT):
+            # Answer conditional requests from the stored validators.
+            return key, get_conditional_response(
+                request,
+                etag=response.get("ETag"),
+                last_modified=parse_http_date_safe(response.get("Last-Modified")),
+                response=response,
+            )
+    return key, None
+
+
+def _store(key, response, timeout, stale):
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    if response.status_code == 200 and not response.cookies:
+        cache.set(key, (time.time() + timeout, response), timeout + stale)
+    _release(key)
+    return response
+
+
+def _release(key):
+    """Let the next request re-render the page behind ``key``."""
+    cache.delete(f"{key}:lock")
+
+
+def cache_anonymous_page(timeout, stale=0, namespaces=lambda request, **kwargs: ()):
+    """
+    Cache a view's 200 responses for anonymous visitors.
+
+    ``namespaces(request, **kwargs)`` names the version namespaces the page
+    depends on in addition to ``site``. Async views are supported; the
+    session, user and cache lookups then run in a worker thread.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                key, response = await sync_to_async(_lookup)(request, namespaces, kwargs)
+                if response is not None:
+                    return response
+                try:
+                    response = await view(request, *args, **kwargs)
+                except BaseException:
+                    if key is not None:
+                        await sync_to_async(_release)(key)
+                    raise
+                if key is None:
+                    return response
+                return await sync_to_async(_store)(key, response, timeout, stale)
+
+        else:
+
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                key, response = _lookup(request, namespaces, kwargs)
+                if response is not None:
+                    return response
+                try:
+                    response = view(request, *args, **kwargs)
+                except BaseException:
+                    if key is not None:
+                        _release(key)
+                    raise
+                if key is None:
+                    return response
+                return _store(key, response, timeout, stale)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,144 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the ordering values of the
+last row of a page. The next page is fetched with keyset_filter(), which
+seeks past that row through the ordering index instead of OFFSET-scanning
+every row before it.
+"""
+import base64
+import datetime
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    payload = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, model, ordering):
+    """
+    Return the values of ``model``'s ``ordering`` fields stored in ``token``.
+    Raise ValueError unless it holds one value of the right type per field.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError("wrong number of values")
+        return [
+            model._meta.get_field(field.lstrip("-")).to_python(_load(value))
+            for field, value in zip(ordering, values)
+        ]
+    except (TypeError, KeyError, ValueError, ValidationError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def keyset_filter(ordering, values):
+    """
+    Build the filter selecting rows that come after ``values`` in ``ordering``,
+    e.g. ``["-date", "-id"]`` gives ``date < d OR (date = d AND id < i)``.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        step = Q(**{f"{name}__{lookup}": values[position]})
+        for previous, value in zip(ordering[:position], values):
+            step &= Q(**{previous.lstrip("-"): value})
+        condition |= step
+    return condition
+
+
+def cursor_values(obj, ordering):
+    return [getattr(obj, field.lstrip("-")) for field in ordering]
+
+
+def _dump(value):
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": value.hex}
+    return value
+
+
+def _load(value):
+    if not isinstance(value, dict):
+        return value
+    if "dt" in value:
+        return datetime.datetime.fromisoformat(value["dt"])
+    if "d" in value:
+        return datetime.date.fromisoformat(value["d"])
+    return uuid.UUID(value["u"])
+
+
+def reverse_ordering(ordering):
+    return [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+
+def approximate_count(queryset, timeout=300):
+    """
+    A cheap row count for display. PostgreSQL's planner estimate is used for
+    whole tables, anything else is counted once and cached for ``timeout``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql" and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been analyzed
+        if row and row[0] >= 0:
+            return row[0]
+
+    key = "approximate-count:" + hashlib.md5(str(queryset.query).encode()).hexdigest()
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+class KeysetPage:
+    """A page of rows with the cursors needed to link to its neighbours."""
+
+    def __init__(self, object_list, ordering, has_next, has_previous, approximate_count=None):
+        self.object_list = object_list
+        self.ordering = ordering
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.approximate_count = approximate_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return encode_cursor(cursor_values(self.object_list[-1], self.ordering))
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return encode_cursor(cursor_values(self.object_list[0], self.ordering))
+        return None
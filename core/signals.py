@@ -0,0 +1,48 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from campaign.models import Campaign
+from core.metrics import install_query_timer
+from core.models import Category
+from core.navigation import invalidate_category_navigation
+from core.page_cache import bump_page_versions
+
+
+@receiver(post_save, sender=Category)
+def generate_category_image_variants(sender, instance, raw, **kwargs):
+    # Receivers run in registration order, so the navigation cache is
+    # invalidated below after the variants are recorded.
+    if not raw:
+        instance.update_image_variants()
+
+
+@receiver(post_delete, sender=Category)
+def delete_category_image_variants(sender, instance, **kwargs):
+    instance.delete_image_variants()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def category_navigation_changed(sender, **kwargs):
+    invalidate_category_navigation()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_pages_changed(sender, **kwargs):
+    # Every page shows the category navigation.
+    bump_page_versions("site")
+
+
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def campaign_pages_changed(sender, instance, **kwargs):
+    bump_page_versions("listing", f"campaign:{instance.pk}")
+
+
+@receiver(connection_created)
+def time_connection_queries(sender, connection, **kwargs):
+    install_query_timer(connection)
@@ -0,0 +1,104 @@
+"""
+Static asset build.
+
+``collectstatic`` is the build step. StaticFilesConfig leaves out the vendor
+files no page loads, and CompressedManifestStaticFilesStorage gives every
+file a content-hashed name, records the names in staticfiles.json for
+``{% static %}``, and writes ``.gz`` and ``.br`` siblings of the hashed
+text assets for nginx's gzip_static and brotli_static. A hashed name never
+changes content, so nginx lets browsers cache it forever.
+"""
+import gzip
+import logging
+
+import brotli
+from django.contrib.staticfiles.apps import StaticFilesConfig as BaseStaticFilesConfig
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# Vendor files shipped in static/ that no template, stylesheet or script loads.
+UNUSED_VENDOR_FILES = [
+    "plugins/ckeditor/*",
+    "plugins/chartjs/*",
+    "plugins/timepicker/*",
+    "plugins/select2/i18n/*",
+    "plugins/select2/select2.js",
+    "plugins/select2/select2.min.js",
+    "plugins/select2/select2.full.js",
+    "plugins/select2/select2.css",
+    "plugins/select2/select2.min.css",
+    "bootstrap/css/bootstrap-theme*",
+    "bootstrap/css/bootstrap.min.css*",
+    "bootstrap/js/bootstrap.js",
+    "bootstrap/js/npm.js",
+    "fonts/FontAwesome.otf",
+    "fonts/ionicons/css/ionicons.css",
+    "js/holder.min.js",
+    "js/ie-emulation-modes-warning.js",
+    "js/ie10-viewport-bug-workaround.js",
+    "js/jquery-ui-1.10.3.custom.min.js",
+    "js/jquery.ui.touch-punch.min.js",
+    "css/jquery-ui-1.8.2.custom.css",
+]
+
+# Formats that are already compressed (images, woff/woff2) gain nothing.
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ttf", ".eot", ".otf", ".ico",
+)
+
+
+class StaticFilesConfig(BaseStaticFilesConfig):
+    ignore_patterns = [*BaseStaticFilesConfig.ignore_patterns, *UNUSED_VENDOR_FILES]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def convert(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                # Vendor stylesheets reference a few files that were never
+                # shipped; those URLs 404 today and are left as they are.
+                if (name, matchobj["url"]) not in self.missing_references:
+                    self.missing_references.add((name, matchobj["url"]))
+                    logger.warning("%s references missing file %s", name, matchobj["url"])
+                return matchobj[0]
+
+        return convert
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Templates still link a few vendor files that were never
+            # shipped; keep their URLs, which 404 as before, rather than
+            # failing the page.
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        self.missing_references = set()
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Pages load the hashed names only.
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as f:
+            content = f.read()
+        for suffix, compressed in (
+            (".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+            (".br", brotli.compress(content, quality=11)),
+        ):
+            # nginx falls back to the original when there is no sibling.
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
@@ -1,5 +1,4 @@
 from django import template
-from django.db.models import Sum
 
 register = template.Library()
 
@@ -26,12 +25,7 @@ def progress_percentage(campaign):
         if campaign.goal <= 0:
             return 0
         
-        total_raised = campaign.donation_set.filter(approved=True).aggregate(
-            Sum('donation')
-        )['donation__sum'] or 0
-        
-        percentage = (total_raised / campaign.goal) * 100
-        return min(100, round(percentage, 1))
+        return min(100, round(campaign.progress_percentage, 1))
     except (ValueError, ZeroDivisionError, AttributeError):
         return 0
 
@@ -39,9 +33,6 @@ def progress_percentage(campaign):
 def total_raised(campaign):
     """Gets the total amount raised for a campaign"""
     try:
-        total = campaign.donation_set.filter(approved=True).aggregate(
-            Sum('donation')
-        )['donation__sum'] or 0
-        return total
+        return campaign.total_raised or 0
     except (ValueError, AttributeError):
         return 0 
\ No newline at end of file
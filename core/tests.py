@@ -1,3 +1,671 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import re
+import shutil
+import sqlite3
+import smtplib
+import tempfile
+import time
+import uuid
+from contextlib import closing
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import brotli
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import connection, transaction
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from campaign.models import Campaign, Donation, PlatformStats
+from core.db_router import (
+    PIN_COOKIE, PrimaryReplicaRouter, ReplicaMiddleware, copy_sqlite_database, read_from_replicas,
+)
+from core.images import VARIANTS, variant_name
+from core.metrics import LATENCY_BUCKETS, registry
+from core.models import Category, OutboxEmail, OutboxStatusChoices
+from core.outbox import claim_due, queue_email, send_pending
+from core.navigation import category_navigation, invalidate_category_navigation
+
+
+class CategoryNavigationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Navigation', slug='navigation')
+
+    def test_navigation_is_cached_until_a_write(self):
+        category_navigation()
+        with self.assertNumQueries(0):
+            names = [category.name for category in category_navigation()]
+        self.assertIn('Navigation', names)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Category.objects.create(name='Another', slug='another')
+            # The version is bumped only once the write commits.
+            with self.assertNumQueries(0):
+                category_navigation()
+        self.assertTrue(callbacks)
+        with self.assertNumQueries(1):
+            names = [category.name for category in category_navigation()]
+        self.assertIn('Another', names)
+
+    def test_categories_page_counts_come_from_annotation(self):
+        self.client.get(reverse('core:categories'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('core:categories'))
+        self.assertContains(response, 'Navigation (0)')
+
+
+class ImageVariantsTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def upload(self, size=(1600, 900)):
+        buffer = BytesIO()
+        Image.new('RGBA', size, (200, 50, 50, 255)).save(buffer, 'PNG')
+        return SimpleUploadedFile('cover.png', buffer.getvalue(), content_type='image/png')
+
+    def variant_files(self, name):
+        return [
+            variant_name(name, variant, ext)
+            for variant in VARIANTS for ext in ('webp', 'jpg')
+            if default_storage.exists(variant_name(name, variant, ext))
+        ]
+
+    def variant_sizes(self, category):
+        storage = category.image.storage
+        sizes = {}
+        for variant in VARIANTS:
+            for ext in ('webp', 'jpg'):
+                with storage.open(variant_name(category.image.name, variant, ext)) as f:
+                    sizes[variant, ext] = Image.open(f).size
+        return sizes
+
+    def test_variants_are_generated_on_upload(self):
+        category = Category.objects.create(name='Pictures', slug='pictures', image=self.upload())
+        category.refresh_from_db()
+
+        self.assertTrue(category.has_image_variants())
+        sizes = self.variant_sizes(category)
+        self.assertEqual(sizes['thumb', 'webp'], (100, 100))
+        self.assertEqual(sizes['card', 'jpg'], (600, 338))
+        self.assertEqual(sizes['hero', 'webp'], (1200, 675))
+        # The square thumb never stands in for the landscape original, but
+        # serves the square category icons
+        self.assertNotIn('.thumb.', category.srcset_webp)
+        self.assertTrue(category.square_srcset_webp.endswith('.thumb.webp 100w'))
+        self.assertIn('.card.webp 600w, ', category.srcset_webp)
+        self.assertIn('.hero.webp 1200w', category.srcset_webp)
+
+    def test_srcset_describes_the_actual_widths(self):
+        category = Category.objects.create(name='Pictures', slug='pictures', image=self.upload((800, 450)))
+        self.assertIn('.hero.jpg 800w', category.srcset_jpeg)
+
+        small = Category.objects.create(name='Small', slug='small', image=self.upload((400, 225)))
+        self.assertEqual(small.srcset_jpeg, f'{small.image.url[:-4]}.card.jpg 400w')
+
+    def test_variants_are_deleted_with_their_upload(self):
+        category = Category.objects.create(name='Pictures', slug='pictures', image=self.upload())
+        first = category.image.name
+        self.assertEqual(len(self.variant_files(first)), len(VARIANTS) * 2)
+
+        category.image = self.upload()
+        category.save()
+        self.assertEqual(self.variant_files(first), [])
+        self.assertTrue(category.has_image_variants())
+
+        category.delete()
+        self.assertEqual(self.variant_files(category.image.name), [])
+
+    def test_missing_image_falls_back_to_the_original(self):
+        category = Category.objects.create(name='Missing', slug='missing', image='categories/missing.jpg')
+        self.assertFalse(category.has_image_variants())
+        self.assertEqual(category.srcset_jpeg, '')
+
+    def test_command_generates_missing_variants(self):
+        category = Category.objects.create(name='Pictures', slug='pictures', image=self.upload())
+        Category.objects.update(image_variants='', image_variant_widths={})
+
+        call_command('generate_image_variants', workers=2, stdout=StringIO(), stderr=StringIO())
+        category.refresh_from_db()
+        self.assertTrue(category.has_image_variants())
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+class RecordingEmailBackend(BaseEmailBackend):
+    """Records whether a transaction was open while each message was sent."""
+
+    in_transaction = []
+
+    def send_messages(self, email_messages):
+        self.in_transaction.append(transaction.get_connection().in_atomic_block)
+        return len(email_messages)
+
+
+class EmailOutboxTestCase(TestCase):
+    def test_worker_sends_queued_email(self):
+        queue_email('Hello', 'Body', ['donor@example.com'])
+        queue_email('Again', 'Body', ['donor@example.com'])
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('send_outbox_emails', batch_size=1, stdout=StringIO())
+        self.assertEqual([message.subject for message in mail.outbox], ['Hello', 'Again'])
+        self.assertFalse(OutboxEmail.objects.exclude(status=OutboxStatusChoices.SENT).exists())
+
+    @override_settings(EMAIL_BACKEND='core.tests.FailingEmailBackend')
+    def test_failures_back_off_then_give_up(self):
+        email = queue_email('Hello', 'Body', ['donor@example.com'])
+
+        self.assertEqual(send_pending(max_attempts=2), (0, 1, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxStatusChoices.PENDING)
+        self.assertIn('SMTPServerDisconnected', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        # Not due yet
+        self.assertEqual(send_pending(max_attempts=2), (0, 0, 0))
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_pending(max_attempts=2), (0, 0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboxStatusChoices.FAILED, 2))
+
+
+    def test_claimed_email_is_skipped_by_other_workers(self):
+        email = queue_email('Hello', 'Body', ['donor@example.com'])
+        self.assertEqual(claim_due(10), [email])
+        # Another worker finds nothing due until the claim expires
+        self.assertEqual(send_pending(), (0, 0, 0))
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_pending(), (1, 0, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 2)
+
+
+class EmailOutboxTransactionTestCase(TransactionTestCase):
+    @override_settings(EMAIL_BACKEND='core.tests.RecordingEmailBackend')
+    def test_sends_outside_any_transaction(self):
+        RecordingEmailBackend.in_transaction.clear()
+        queue_email('Hello', 'Body', ['donor@example.com'])
+
+        self.assertEqual(send_pending(), (1, 0, 0))
+        self.assertEqual(RecordingEmailBackend.in_transaction, [False])
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxStatusChoices.SENT)
+
+
+class AnonymousPageCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='owner', password='testpass123')
+        self.category = Category.objects.create(name='Cached', slug='cached')
+        self.campaign = Campaign.objects.create(
+            title='Cached Campaign',
+            description='Test Description',
+            user=self.user,
+            category=self.category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg',
+            is_active=True,
+        )
+        self.detail_url = reverse('campaign:campaign-detail', args=[self.campaign.pk])
+
+    def test_repeat_anonymous_hits_are_served_from_cache(self):
+        self.client.get(reverse('core:home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('core:home'))
+        self.assertContains(response, 'Cached Campaign')
+
+        # Different query strings are different pages
+        with self.assertNumQueries(0):
+            self.client.get(reverse('core:about'))
+            self.client.get(reverse('core:about'))
+        self.assertIsNotNone(self.client.get(reverse('core:home'), {'page': 2}).context)
+
+    def test_authenticated_users_bypass_the_cache(self):
+        self.client.get(reverse('core:home'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('core:home'))
+        self.assertIsNotNone(response.context)
+
+    def test_writes_invalidate_only_affected_pages(self):
+        other = reverse('core:about')
+        self.client.get(self.detail_url)
+        self.client.get(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(
+                campaign=self.campaign, fullname='Donor', email='d@example.com',
+                country='India', postal_code='1', donation=75, approved=True,
+                date=timezone.now().date(),
+            )
+        self.assertContains(self.client.get(self.detail_url), '75')
+        with self.assertNumQueries(0):
+            self.client.get(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Renamed'
+            self.category.save()
+        self.assertContains(self.client.get(other), 'Renamed')
+
+    def test_approved_donations_refresh_listings(self):
+        home = reverse('core:home')
+        self.client.get(home)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Donation.objects.create(
+                campaign=self.campaign, fullname='Donor', email='d@example.com',
+                country='India', postal_code='1', donation=75, approved=False,
+                date=timezone.now().date(),
+            )
+        # Pending amounts are not shown on listings, which stay cached.
+        with self.assertNumQueries(0):
+            self.client.get(home)
+
+        donation = Donation.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            donation.approved = True
+            donation.save()
+        self.assertContains(self.client.get(home), '₹75')
+
+    def test_failed_rerender_releases_the_lock(self):
+        self.client.get(self.detail_url)
+        Campaign.objects.filter(pk=self.campaign.pk).update(title='Retitled')
+
+        later = time.time() + 30
+        with mock.patch('core.page_cache.time.time', return_value=later):
+            with mock.patch('campaign.views.CampaignDetailView.get_context_data', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    self.client.get(self.detail_url)
+            # The next request may re-render straight away.
+            self.assertContains(self.client.get(self.detail_url), 'Retitled')
+
+    def test_stale_page_is_served_while_one_request_revalidates(self):
+        self.client.get(self.detail_url)
+        Campaign.objects.filter(pk=self.campaign.pk).update(title='Retitled')
+
+        later = time.time() + 30
+        with mock.patch('core.page_cache.time.time', return_value=later):
+            # Another request is already re-rendering: serve the stale copy.
+            with mock.patch('core.page_cache.cache.add', return_value=False):
+                with self.assertNumQueries(0):
+                    self.assertNotContains(self.client.get(self.detail_url), 'Retitled')
+            self.assertContains(self.client.get(self.detail_url), 'Retitled')
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.url = reverse('core:metrics')
+
+    def test_records_per_view_metrics(self):
+        self.client.get(reverse('core:about'))
+        self.client.get(reverse('core:about'))
+        self.client.get('/no-such-page/')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn('django_request_latency_seconds_count{view="core:about"} 2', body)
+        self.assertIn('django_request_latency_seconds_bucket{view="core:about",le="+Inf"} 2', body)
+        self.assertIn('django_request_db_queries_total{view="core:about"}', body)
+        self.assertIn('django_request_latency_seconds_count{view="<unresolved>"} 1', body)
+        size = len(self.client.get(reverse('core:about')).content)
+        self.assertIn(f'django_response_bytes_total{{view="core:about"}} {size * 2}', body)
+
+    def test_counts_queries(self):
+        Category.objects.create(name='Metrics', slug='metrics')
+        self.client.get(reverse('core:categories'))
+        stats = registry.snapshot()['core:categories']
+        self.assertEqual(stats['queries'], 1)
+        self.assertGreater(stats['db_seconds'], 0)
+
+    async def test_counts_queries_under_asgi(self):
+        await Category.objects.acreate(name='Metrics', slug='metrics')
+        await self.async_client.get(reverse('core:categories'))
+        await self.async_client.get(reverse('campaign:campaign-detail', args=[uuid.uuid4()]))
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['core:categories']['queries'], 1)
+        # The validators and the campaign, read by the async view in the ORM's worker thread
+        self.assertEqual(snapshot['campaign:campaign-detail']['queries'], 2)
+
+    def test_restricted_to_internal_ips(self):
+        response = self.client.get(self.url, REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 404)
+        with override_settings(METRICS_ALLOWED_IPS=['203.0.113.0/24']):
+            response = self.client.get(self.url, REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 200)
+
+    def test_merges_workers_through_shared_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # Totals written by another worker process
+        other = {'core:about': {
+            'count': 3, 'latency_sum': 0.3, 'buckets': [3] + [0] * len(LATENCY_BUCKETS),
+            'queries': 6, 'db_seconds': 0.1, 'response_bytes': 300,
+        }}
+        with open(f'{directory}/1-1.json', 'w') as f:
+            json.dump(other, f)
+
+        with override_settings(METRICS_DIR=directory):
+            self.client.get(reverse('core:about'))
+            body = self.client.get(self.url).content.decode()
+        self.assertIn('django_request_latency_seconds_count{view="core:about"} 4', body)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Routing decisions only; no query runs, so no replica database is needed."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, method, path, cookies=None):
+        """Send a request through ReplicaMiddleware; return the read alias and the response."""
+        request = getattr(self.factory, method)(path)
+        request.COOKIES.update(cookies or {})
+        request.resolver_match = resolve(path)
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Campaign))
+            return HttpResponse()
+
+        def handler(request):
+            # The view middleware runs inside the middleware chain.
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReplicaMiddleware(handler)
+        response = middleware(request)
+        return seen[0], response
+
+    def test_reads_go_to_the_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Campaign), 'default')
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_read(Campaign), 'replica1')
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+        with override_settings(DATABASE_REPLICAS=[]), read_from_replicas():
+            self.assertEqual(self.router.db_for_read(Campaign), 'default')
+
+    def test_configured_views_read_from_replicas(self):
+        self.assertEqual(self.route('get', reverse('campaign:campaign-list'))[0], 'replica1')
+        self.assertEqual(self.route('get', reverse('core:home'))[0], 'default')
+        self.assertEqual(self.route('post', reverse('campaign:campaign-list'))[0], 'default')
+        # The routing does not leak past the request
+        self.assertEqual(self.router.db_for_read(Campaign), 'default')
+
+    def test_writers_read_their_own_writes(self):
+        _, response = self.route('post', reverse('core:home'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(
+            self.route('get', reverse('campaign:campaign-list'), {PIN_COOKIE: '1'})[0], 'default'
+        )
+
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_write(Campaign), 'default')
+            self.assertEqual(self.router.db_for_read(Campaign), 'default')
+
+    def test_shared_caches_are_built_from_the_primary(self):
+        seen = []
+
+        def categories(**annotations):
+            seen.append(self.router.db_for_read(Category))
+            return Category.objects.none()
+
+        invalidate_category_navigation()
+        with read_from_replicas(), mock.patch.object(Category.objects, 'annotate', categories):
+            category_navigation()
+            self.assertEqual(self.router.db_for_read(Category), 'replica1')
+        self.assertEqual(seen, ['default'])
+
+    def test_only_the_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate('default', 'campaign'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'campaign'))
+
+    def test_copy_sqlite_database(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        primary, replica = f'{directory}/primary.sqlite3', f'{directory}/replica.sqlite3'
+        with closing(sqlite3.connect(primary)) as db, db:
+            db.execute('CREATE TABLE t (v)')
+            db.execute('INSERT INTO t VALUES (42)')
+
+        copy_sqlite_database(primary, replica)
+        with closing(sqlite3.connect(replica)) as db:
+            self.assertEqual(db.execute('SELECT v FROM t').fetchall(), [(42,)])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTestCase(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query the hot views issue and fails on
+    a full table scan or a temporary B-tree built to sort. Scans through an
+    index (counts, ordered scans stopped by LIMIT) are fine; so are tables
+    small enough by design that a scan is the best plan.
+    """
+    SMALL_TABLES = {
+        'core_category', 'core_country', 'django_session', 'campaign_platformstats',
+        'django_content_type', 'auth_permission',
+    }
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.owner = User.objects.create_user(
+            username='owner', email='owner@example.com', password='testpass123'
+        )
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='testpass123'
+        )
+        self.category = Category.objects.create(name='Plans', slug='plans')
+        today = timezone.now().date()
+        campaigns = [
+            Campaign.objects.create(
+                title=f'Campaign {i}',
+                description='Test Description',
+                user=self.owner,
+                category=self.category,
+                goal=1000,
+                location='Test Location',
+                deadline=today + timedelta(days=30),
+                image='test.jpg',
+                status='approved' if i % 2 else 'pending',
+            )
+            for i in range(6)
+        ]
+        self.campaign = campaigns[1]
+        for i in range(30):
+            Donation.objects.create(
+                campaign=campaigns[i % len(campaigns)],
+                fullname=f'Donor {i}',
+                email='owner@example.com' if i % 3 == 0 else f'donor{i}@example.com',
+                country='India',
+                postal_code='110001',
+                donation=10 + i,
+                # The oldest ones are pending
+                approved=i < 24,
+                date=today - timedelta(days=i),
+            )
+        # Enough rows around them that a scan costs more than an index, and
+        # statistics so the planner chooses as it would in production.
+        owners = User.objects.bulk_create(
+            User(username=f'other{i}', email=f'other{i}@example.com') for i in range(50)
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f'Other {i}', slug=f'other-{i}') for i in range(10)
+        )
+        others = Campaign.objects.bulk_create(
+            Campaign(
+                title=f'Other campaign {i}',
+                description='Test Description',
+                user=owners[i % len(owners)],
+                category=categories[i % len(categories)],
+                goal=1000,
+                location='Test Location',
+                deadline=today + timedelta(days=i % 60),
+                image='test.jpg',
+                status='approved',
+            )
+            for i in range(300)
+        )
+        Donation.objects.bulk_create(
+            Donation(
+                campaign=others[i % len(others)],
+                fullname=f'Donor {i}',
+                email=f'donor{i % 500}@example.com',
+                country='India',
+                postal_code='110001',
+                donation=10,
+                approved=True,
+                date=today - timedelta(days=i % 365),
+            )
+            for i in range(3000)
+        )
+        call_command('reconcile_campaign_totals', stdout=StringIO())
+        call_command('backfill_daily_stats', stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        # Seeded once per deployment; its recount is not a request-time query.
+        PlatformStats.load()
+
+    def assertIndexedPlans(self, url, user=None, allow_sort=False):
+        cache.clear()
+        if user is not None:
+            self.client.force_login(user)
+        else:
+            self.client.logout()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT'):
+                    continue
+                table = re.search(r'FROM "(\w+)"', sql)
+                if table is None:
+                    self.fail(f'{url}: no table to check in\n{sql}')
+                if table[1] in self.SMALL_TABLES:
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                for _, _, _, detail in cursor.fetchall():
+                    scanned = re.fullmatch(r'SCAN (\w+)', detail)
+                    if scanned and scanned[1] not in self.SMALL_TABLES:
+                        self.fail(f'{url}: full scan of {scanned[1]} in\n{sql}')
+                    if 'USE TEMP B-TREE FOR ORDER BY' in detail and not allow_sort:
+                        self.fail(f'{url}: sort without an index in\n{sql}')
+
+    def test_public_pages(self):
+        for url in (
+            reverse('core:home'),
+            reverse('core:categories'),
+            reverse('core:campaigns-by-category', args=[self.category.pk]),
+            reverse('campaign:campaign-list'),
+            reverse('campaign:campaign-detail', args=[self.campaign.pk]),
+            reverse('campaign:campaign-donation', args=[self.campaign.pk]),
+            reverse('campaign:load-more-donations', args=[self.campaign.pk]),
+        ):
+            self.assertIndexedPlans(url)
+
+    def test_load_more_with_cursor(self):
+        url = reverse('campaign:load-more-donations', args=[self.campaign.pk])
+        cursor = self.client.get(url, {'limit': 2}).json()['next_cursor']
+        self.assertIndexedPlans(f'{url}?limit=2&cursor={cursor}')
+
+    def test_owner_dashboard(self):
+        self.assertIndexedPlans(reverse('dashboard:home'), self.owner)
+        self.assertIndexedPlans(reverse('dashboard:campaigns'), self.owner)
+        # Donations are reached through the owner's campaigns and sorted
+        # among themselves; no single index orders them across campaigns.
+        self.assertIndexedPlans(reverse('dashboard:donations'), self.owner, allow_sort=True)
+
+    def test_admin_dashboard(self):
+        for url in (
+            reverse('admin_dashboard:home'),
+            reverse('admin_dashboard:campaigns'),
+            reverse('admin_dashboard:donations'),
+            reverse('admin_dashboard:members'),
+        ):
+            self.assertIndexedPlans(url, self.admin)
+
+
+@override_settings(
+    STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage'},
+    },
+)
+class StaticBuildTestCase(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        self.css = 'body { background: url("../img/bg.png"); }\n.old { background: url("gone.png"); }\n' * 20
+        for name, content in (
+            ('css/site.css', self.css),
+            ('img/bg.png', 'png'),
+            ('plugins/ckeditor/ckeditor.js', 'var CKEDITOR = {};'),
+        ):
+            os.makedirs(os.path.dirname(f'{self.source}/{name}'), exist_ok=True)
+            with open(f'{self.source}/{name}', 'w') as f:
+                f.write(content)
+
+    def test_collectstatic_builds_hashed_precompressed_assets(self):
+        with override_settings(STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root):
+            with self.assertLogs('core.staticfiles', 'WARNING') as logs:
+                call_command('collectstatic', interactive=False, verbosity=0)
+            url = staticfiles_storage.url('css/site.css')
+            # Linked by a template but never shipped: the URL is kept rather than failing the page
+            self.assertEqual(staticfiles_storage.url('js/gone.js'), '/static/js/gone.js')
+
+        with open(f'{self.root}/staticfiles.json') as f:
+            manifest = json.load(f)['paths']
+        self.assertNotIn('plugins/ckeditor/ckeditor.js', manifest)
+        self.assertFalse(os.path.exists(f'{self.root}/plugins'))
+        self.assertEqual(url, f"/static/{manifest['css/site.css']}")
+
+        path = f"{self.root}/{manifest['css/site.css']}"
+        with open(path, 'rb') as f:
+            css = f.read()
+        self.assertIn(manifest['img/bg.png'].split('/')[-1].encode(), css)
+        # A reference to a file that was never shipped is left alone
+        self.assertIn(b'url("gone.png")', css)
+        self.assertEqual(len(logs.output), 1)
+
+        with open(f'{path}.gz', 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), css)
+        with open(f'{path}.br', 'rb') as f:
+            self.assertEqual(brotli.decompress(f.read()), css)
+        # Images are already compressed
+        self.assertFalse(os.path.exists(f"{self.root}/{manifest['img/bg.png']}.gz"))
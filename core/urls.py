@@ -2,21 +2,26 @@ from django.conf.urls.static import static
 from django.urls import path, include
 
 from qonty import settings
+from .page_cache import cache_anonymous_page
 from .views import *
 
 app_name = "core"
 
+listing_page = cache_anonymous_page(60, stale=300, namespaces=lambda request, **kwargs: ["listing"])
+static_page = cache_anonymous_page(60 * 60)
+
 urlpatterns = [
-    path('', HomeView.as_view(), name="home"),
-    path('categories', CategoryListView.as_view(), name="categories"),
-    path('campaigns-by-category/<int:pk>', CampaignsByCategoryView.as_view(), name="campaigns-by-category"),
-    path('how-it-works/', HowItWorksView.as_view(), name='how-it-works'),
-    path('about/', TemplateView.as_view(template_name='static_pages/about.html'), name='about'),
-    path('terms/', TemplateView.as_view(template_name='static_pages/terms.html'), name='terms'),
-    path('privacy/', TemplateView.as_view(template_name='static_pages/privacy.html'), name='privacy'),
-    path('help/', TemplateView.as_view(template_name='static_pages/help.html'), name='help'),
-    path('success-stories/', TemplateView.as_view(template_name='static_pages/success.html'), name='success-stories'),
-    path('guidelines/', TemplateView.as_view(template_name='static_pages/guidelines.html'), name='guidelines'),
+    path('', listing_page(HomeView.as_view()), name="home"),
+    path('categories', listing_page(CategoryListView.as_view()), name="categories"),
+    path('campaigns-by-category/<int:pk>', listing_page(CampaignsByCategoryView.as_view()), name="campaigns-by-category"),
+    path('how-it-works/', static_page(HowItWorksView.as_view()), name='how-it-works'),
+    path('about/', static_page(TemplateView.as_view(template_name='static_pages/about.html')), name='about'),
+    path('terms/', static_page(TemplateView.as_view(template_name='static_pages/terms.html')), name='terms'),
+    path('privacy/', static_page(TemplateView.as_view(template_name='static_pages/privacy.html')), name='privacy'),
+    path('help/', static_page(TemplateView.as_view(template_name='static_pages/help.html')), name='help'),
+    path('success-stories/', static_page(TemplateView.as_view(template_name='static_pages/success.html')), name='success-stories'),
+    path('guidelines/', static_page(TemplateView.as_view(template_name='static_pages/guidelines.html')), name='guidelines'),
+    path('metrics', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
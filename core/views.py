@@ -1,11 +1,11 @@
-from django.db import models
-from django.db.models import Q, Sum
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView, TemplateView
 
-from accounts.models import User
-from campaign.models import Campaign, Donation
+from campaign.models import Campaign, PlatformStats
+from core.metrics import is_internal, registry, render_metrics
 from core.models import Category
+from core.navigation import category_navigation
 
 
 class HomeView(ListView):
@@ -15,9 +15,7 @@ class HomeView(ListView):
     
     def get_queryset(self):
         # Get 8 most recent active campaigns (is_active=True OR status in ['approved', 'active'])
-        return Campaign.objects.filter(
-            models.Q(is_active=True) | models.Q(status__in=['approved', 'active'])
-        ).prefetch_related(
+        return Campaign.objects.active().with_stats().select_related(
             "user"
         ).order_by(
             '-date'
@@ -25,13 +23,10 @@ class HomeView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Count campaigns as active if they have is_active=True OR status in ['approved', 'active']
-        active_campaigns = Campaign.objects.filter(
-            models.Q(is_active=True) | models.Q(status__in=['approved', 'active'])
-        )
-        context["total_campaigns"] = active_campaigns.count()
-        context["fund_raised"] = Donation.objects.filter(approved=True).aggregate(Sum("donation"))
-        context["members"] = User.objects.count()
+        stats = PlatformStats.load()
+        context["total_campaigns"] = stats.active_campaigns
+        context["fund_raised"] = stats.raised
+        context["members"] = stats.members
         return context
 
 
@@ -39,7 +34,9 @@ class CategoryListView(ListView):
     model = Category
     template_name = "categories.html"
     context_object_name = "categories"
-    queryset = Category.objects.prefetch_related("campaign_set").all()
+
+    def get_queryset(self):
+        return category_navigation()
 
 
 class CampaignsByCategoryView(DetailView):
@@ -48,6 +45,13 @@ class CampaignsByCategoryView(DetailView):
     context_object_name = "category"
     object = None
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["campaigns"] = list(
+            self.object.campaign_set.with_stats().select_related("user")
+        )
+        return context
+
 
 class HowItWorksView(TemplateView):
     template_name = "how-it-works.html"
@@ -77,3 +81,13 @@ class HowItWorksView(TemplateView):
             }
         ]
         return context
+
+
+def metrics(request):
+    """Per-view request metrics for Prometheus; hidden from non-internal clients."""
+    if not is_internal(request):
+        raise Http404
+    return HttpResponse(
+        render_metrics(registry.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -6,6 +6,7 @@ from .views.admin_views import (
     AdminCampaignEditView,
     AdminCampaignDeleteView,
     AdminDonationsView,
+    AdminDonationImportView,
     AdminCategoriesView,
     AdminCategoryCreateView,
     AdminCategoryUpdateView,
@@ -24,6 +25,7 @@ urlpatterns = [
     path('campaigns/delete/', AdminCampaignDeleteView.as_view(), name='campaign-delete'),
     
     path('donations/', AdminDonationsView.as_view(), name='donations'),
+    path('donations/import/', AdminDonationImportView.as_view(), name='donation-import'),
     
     path('categories/', AdminCategoriesView.as_view(), name='categories'),
     path('categories/create/', AdminCategoryCreateView.as_view(), name='category-create'),
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+CHART_RANGES = (7, 30, 90, 365)
+CHART_BUCKETS = ("day", "week", "month")
+
+_TRUNCATE = {"week": TruncWeek, "month": TruncMonth}
+
+
+def chart_options(request, default_range=30, default_bucket="day"):
+    """Read the ``range`` (days) and ``bucket`` query parameters, falling back to defaults."""
+    try:
+        days = int(request.GET.get("range", default_range))
+    except ValueError:
+        days = default_range
+    if days not in CHART_RANGES:
+        days = default_range
+    bucket = request.GET.get("bucket", default_bucket)
+    if bucket not in CHART_BUCKETS:
+        bucket = default_bucket
+    return days, bucket
+
+
+def _bucket_start(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def daily_stat_chart(queryset, days, bucket, amount="approved_amount", count="approved_count"):
+    """
+    Build chart series from a DailyStat ``queryset`` over the last ``days``
+    days, grouped per ``bucket``. Returns ``(labels, amounts, counts)`` with a
+    zero-filled entry for every bucket in the range.
+    """
+    end = timezone.now().date()
+    start = end - timedelta(days=days)
+
+    rows = queryset.filter(day__gte=start, day__lte=end)
+    if bucket in _TRUNCATE:
+        rows = rows.annotate(bucket=_TRUNCATE[bucket]("day")).values("bucket")
+    else:
+        rows = rows.values(bucket=F("day"))
+    totals = {
+        row["bucket"]: row
+        for row in rows.annotate(total=Sum(amount), total_count=Sum(count)).order_by()
+    }
+
+    labels, amounts, counts = [], [], []
+    current = _bucket_start(start, bucket)
+    while current <= end:
+        row = totals.get(current, {})
+        labels.append(current.strftime("%Y-%m-%d"))
+        amounts.append(float(row.get("total") or 0))
+        counts.append(row.get("total_count") or 0)
+        if bucket == "month":
+            current = (current + timedelta(days=32)).replace(day=1)
+        elif bucket == "week":
+            current += timedelta(days=7)
+        else:
+            current += timedelta(days=1)
+    return labels, amounts, counts
@@ -1,9 +1,63 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.http import Http404
 from django.shortcuts import redirect
 
+from core.pagination import (
+    KeysetPage,
+    approximate_count,
+    decode_cursor,
+    keyset_filter,
+    reverse_ordering,
+)
+
 
 class SuperUserRequiredMixin(LoginRequiredMixin):
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_superuser:
             return redirect("core:home")
         return super().dispatch(request, *args, **kwargs)
+
+
+class KeysetPaginationMixin:
+    """
+    Paginate a ListView by cursor instead of page number.
+
+    Pages are selected with ``?after=<cursor>``/``?before=<cursor>`` (or
+    ``?last=1``) seeking through ``keyset_ordering``, which must end with a
+    unique field, so every page costs the same as the first. The paginator's
+    exact COUNT is replaced with an approximate total.
+    """
+
+    keyset_ordering = None
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.keyset_ordering
+        after = self.request.GET.get("after")
+        before = self.request.GET.get("before")
+        try:
+            if before or self.request.GET.get("last"):
+                # Walk backwards from the cursor (or the end) and flip the rows
+                backwards = reverse_ordering(ordering)
+                rows = queryset.order_by(*backwards)
+                if before:
+                    rows = rows.filter(keyset_filter(backwards, decode_cursor(before, queryset.model, backwards)))
+                rows = list(rows[:page_size + 1])
+                has_previous = len(rows) > page_size
+                rows = rows[:page_size][::-1]
+                has_next = bool(before)
+            else:
+                rows = queryset.order_by(*ordering)
+                if after:
+                    rows = rows.filter(keyset_filter(ordering, decode_cursor(after, queryset.model, ordering)))
+                rows = list(rows[:page_size + 1])
+                has_next = len(rows) > page_size
+                rows = rows[:page_size]
+                has_previous = bool(after)
+        except (ValueError, ValidationError):
+            raise Http404("Invalid page cursor")
+
+        page = KeysetPage(
+            rows, ordering, has_next, has_previous, approximate_count(queryset.order_by())
+        )
+        return (None, page, rows, page.has_other_pages())
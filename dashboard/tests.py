@@ -1,3 +1,177 @@
+import base64
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from campaign.models import Campaign, Donation
+from core.models import Category
+
+User = get_user_model()
+
+
+class AdminKeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        category = Category.objects.create(name='Admin', slug='admin')
+        self.campaign = Campaign.objects.create(
+            title='Admin Campaign',
+            description='Test Description',
+            user=self.admin,
+            category=category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+        today = timezone.now().date()
+        for index in range(25):
+            Donation.objects.create(
+                campaign=self.campaign,
+                fullname=f'Donor {index}',
+                email='donor@example.com',
+                country='Test Country',
+                postal_code='12345',
+                donation=10,
+                approved=True,
+                date=today - timedelta(days=index % 3)
+            )
+        self.expected = list(Donation.objects.order_by('-date', '-id'))
+
+    def test_next_previous_and_last_pages(self):
+        url = reverse('admin_dashboard:donations')
+        pages = []
+        params = {}
+        while True:
+            response = self.client.get(url, params)
+            page = response.context['page_obj']
+            pages.append(list(page))
+            self.assertEqual(page.approximate_count, 25)
+            if not page.has_next():
+                break
+            params = {'after': page.next_cursor}
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(p) for p in pages], [10, 10, 5])
+
+        response = self.client.get(url, {'before': page.previous_cursor})
+        self.assertEqual(list(response.context['page_obj']), pages[1])
+
+        response = self.client.get(url, {'last': 1})
+        self.assertEqual(list(response.context['page_obj']), self.expected[-10:])
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse('admin_dashboard:members'), {'after': '!!'})
+        self.assertEqual(response.status_code, 404)
+
+        # Well-formed tokens of the wrong length, shape or types
+        for payload in ('[1]', '{"a":1}', '["abc","x"]', '[{"dt":"2024-01-01T00:00:00"},"x"]'):
+            cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+            for name in ('admin_dashboard:members', 'admin_dashboard:donations'):
+                for direction in ('after', 'before'):
+                    with self.subTest(payload=payload, name=name, direction=direction):
+                        response = self.client.get(reverse(name), {direction: cursor})
+                        self.assertEqual(response.status_code, 404)
+
+    def test_campaign_and_member_lists_render(self):
+        for name in ('admin_dashboard:campaigns', 'admin_dashboard:members'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['page_obj']), 1)
+
+
+class DonationImportUploadTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='importer',
+            email='importer@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        category = Category.objects.create(name='Import', slug='import')
+        self.campaign = Campaign.objects.create(
+            title='Import Campaign',
+            description='Test Description',
+            user=self.admin,
+            category=category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+
+    def test_donation_import_upload(self):
+        upload = SimpleUploadedFile('offline.csv', (
+            'campaign,fullname,email,country,postal_code,donation,date\n'
+            f'{self.campaign.pk},Bank Transfer,bank@example.com,India,12345,100,2024-03-01\n'
+        ).encode())
+        response = self.client.post(reverse('admin_dashboard:donation-import'), {'file': upload}, follow=True)
+
+        self.assertContains(response, 'Imported 1 donations, skipped 0 invalid rows.')
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.raised_total, 100)
+
+
+class DashboardChartTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+        category = Category.objects.create(name='Charts', slug='charts')
+        campaign = Campaign.objects.create(
+            title='Chart Campaign',
+            description='Test Description',
+            user=self.admin,
+            category=category,
+            goal=1000,
+            location='Test Location',
+            deadline=timezone.now().date() + timedelta(days=30),
+            image='test.jpg'
+        )
+        today = timezone.now().date()
+        for days_ago, approved in ((0, True), (0, False), (3, True), (40, True)):
+            Donation.objects.create(
+                campaign=campaign,
+                fullname='Donor',
+                email='admin@example.com',
+                country='Test Country',
+                postal_code='12345',
+                donation=10,
+                approved=approved,
+                date=today - timedelta(days=days_ago)
+            )
+
+    def test_admin_chart_ranges(self):
+        url = reverse('admin_dashboard:home')
+        response = self.client.get(url)
+        self.assertEqual(response.context['chart_range'], 30)
+        self.assertEqual(len(response.context['chart_dates']), 31)
+        self.assertEqual(sum(response.context['chart_amounts']), 20)
+
+        response = self.client.get(url, {'range': 90, 'bucket': 'month'})
+        self.assertEqual(sum(response.context['chart_amounts']), 30)
+        self.assertLessEqual(len(response.context['chart_dates']), 4)
+
+        response = self.client.get(url, {'range': 'bogus', 'bucket': 'year'})
+        self.assertEqual(response.context['chart_range'], 30)
+        self.assertEqual(response.context['chart_bucket'], 'day')
 
-# Create your tests here.
+    def test_user_chart_counts_all_donations_given(self):
+        response = self.client.get(reverse('dashboard:home'), {'range': 7, 'bucket': 'week'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(response.context['chart_amounts']), 30)
+        self.assertEqual(sum(response.context['chart_counts']), 3)
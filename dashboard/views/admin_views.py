@@ -1,34 +1,27 @@
 from django.shortcuts import render, redirect
 from django.views import View
-from django.views.generic import ListView, UpdateView, CreateView
+from django.views.generic import ListView, UpdateView, CreateView, FormView
 from django.db import models
-from django.db.models import Sum, Count
-from django.db.models.functions import TruncDay
-from django.utils import timezone
-from datetime import timedelta, datetime
+from django.db.models import Count
 from django.contrib import messages
 from django.urls import reverse_lazy
 
 from core.models import Category
-from dashboard.mixins import SuperUserRequiredMixin
-from campaign.models import Campaign, Donation, CampaignStatusChoices
-from campaign.forms import CampaignForm
+from dashboard.charts import CHART_BUCKETS, CHART_RANGES, chart_options, daily_stat_chart
+from dashboard.mixins import KeysetPaginationMixin, SuperUserRequiredMixin
+from campaign.models import Campaign, Donation, DonationDailyStat, PlatformStats, CampaignStatusChoices
+from campaign.forms import CampaignForm, DonationImportForm
+from campaign.imports import detect_format, import_donations
 from accounts.models import User
 from core.forms import CategoryForm
 
 
 class AdminDashboardView(SuperUserRequiredMixin, View):
     def get(self, request):
-        # Get date 30 days ago
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-
-        # Get daily donations for last 30 days
-        daily_donations = (
-            Donation.objects.filter(date__gte=thirty_days_ago, approved=True)
-            .annotate(day=TruncDay("date"))
-            .values("day")
-            .annotate(total=Sum("donation"), count=Count("id"))
-            .order_by("day")
+        # Approved donations per day/week/month, read from the daily rollups
+        chart_range, chart_bucket = chart_options(request)
+        dates, amounts, counts = daily_stat_chart(
+            DonationDailyStat.objects.all(), chart_range, chart_bucket
         )
 
         # Get latest members
@@ -39,44 +32,21 @@ class AdminDashboardView(SuperUserRequiredMixin, View):
         # Get recent campaigns
         recent_campaigns = Campaign.objects.select_related("user").order_by("-date")[:4]
 
-        # Prepare chart data
-        dates = []
-        amounts = []
-        counts = []
-
-        current_date = thirty_days_ago.date()
-        end_date = timezone.now().date()
-
-        # Create lookup dictionary
-        donations_dict = {
-            d["day"].strftime("%Y-%m-%d"): {"total": d["total"], "count": d["count"]}
-            for d in daily_donations
-        }
-        
-        while current_date <= end_date:
-            dates.append(current_date.strftime("%Y-%m-%d"))
-            # Convert current_date to datetime for dictionary lookup
-            current_datetime = timezone.make_aware(
-                datetime.combine(current_date, datetime.min.time())
-            )
-            day_data = donations_dict.get(current_datetime.strftime("%Y-%m-%d"), {"total": 0, "count": 0})
-            amounts.append(float(day_data["total"] or 0))
-            counts.append(day_data["count"])
-            current_date += timedelta(days=1)
-
+        stats = PlatformStats.load()
         context = {
-            "total_donations": Donation.objects.filter(approved=True).count(),
-            "total_earnings": Donation.objects.filter(approved=True).aggregate(
-                Sum("donation")
-            )["donation__sum"]
-            or 0,
-            "total_members": User.objects.count(),
-            "total_campaigns": Campaign.objects.count(),
+            "total_donations": stats.donations,
+            "total_earnings": stats.raised,
+            "total_members": stats.members,
+            "total_campaigns": stats.campaigns,
             "latest_members": latest_members,
             "recent_campaigns": recent_campaigns,
             "chart_dates": dates,
             "chart_amounts": amounts,
             "chart_counts": counts,
+            "chart_range": chart_range,
+            "chart_bucket": chart_bucket,
+            "chart_ranges": CHART_RANGES,
+            "chart_buckets": CHART_BUCKETS,
         }
         
         # print(context)
@@ -84,67 +54,72 @@ class AdminDashboardView(SuperUserRequiredMixin, View):
         return render(request, "dashboard/admin/dashboard.html", context)
 
 
-class AdminCampaignsView(SuperUserRequiredMixin, ListView):
+class AdminCampaignsView(SuperUserRequiredMixin, KeysetPaginationMixin, ListView):
     model = Campaign
     template_name = "dashboard/admin/campaigns.html"
     context_object_name = "campaigns"
     paginate_by = 10
+    keyset_ordering = ["-date", "-id"]
 
     def get_queryset(self):
         return (
-            Campaign.objects.select_related("user", "category")
-            .prefetch_related("donation_set")
-            .order_by("-date")
+            Campaign.objects.with_stats(live=True)
+            .select_related("user", "category")
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        stats = PlatformStats.load()
         context.update(
             {
-                "total_campaigns": Campaign.objects.count(),
-                "total_raised": Donation.objects.filter(approved=True).aggregate(
-                    Sum("donation")
-                )["donation__sum"]
-                or 0,
+                "total_campaigns": stats.campaigns,
+                "total_raised": stats.raised,
             }
         )
         return context
 
 
-class AdminDonationsView(SuperUserRequiredMixin, ListView):
+class AdminDonationsView(SuperUserRequiredMixin, KeysetPaginationMixin, ListView):
     model = Donation
     template_name = "dashboard/admin/donations.html"
     context_object_name = "donations"
     paginate_by = 10
+    keyset_ordering = ["-date", "-id"]
 
     def get_queryset(self):
-        return Donation.objects.select_related("campaign").order_by("-date", "-id")
+        return Donation.objects.select_related("campaign")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        stats = PlatformStats.load()
         context.update(
             {
-                "total_donations": Donation.objects.filter(approved=True).count(),
-                "total_amount": Donation.objects.filter(approved=True).aggregate(
-                    Sum("donation")
-                )["donation__sum"]
-                or 0,
-                "pending_amount": Donation.objects.filter(approved=False).aggregate(
-                    Sum("donation")
-                )["donation__sum"]
-                or 0,
-                "admin_earnings": (
-                    Donation.objects.filter(approved=True).aggregate(Sum("donation"))[
-                        "donation__sum"
-                    ]
-                    or 0
-                )
-                * 0.05,  # 5% platform fee
+                "total_donations": stats.donations,
+                "total_amount": stats.raised,
+                "pending_amount": stats.pending,
+                "admin_earnings": stats.platform_earnings,
             }
         )
         return context
 
 
+class AdminDonationImportView(SuperUserRequiredMixin, FormView):
+    form_class = DonationImportForm
+    template_name = "dashboard/admin/donation-import.html"
+    success_url = reverse_lazy("admin_dashboard:donations")
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["file"]
+        result = import_donations(upload.file, detect_format(upload.name))
+        messages.success(
+            self.request,
+            f"Imported {result.imported} donations, skipped {result.skipped} invalid rows.",
+        )
+        for line, message in result.errors:
+            messages.warning(self.request, f"Line {line}: {message}")
+        return super().form_valid(form)
+
+
 class AdminCampaignEditView(SuperUserRequiredMixin, UpdateView):
     model = Campaign
     form_class = CampaignForm
@@ -229,14 +204,15 @@ class AdminCategoryDeleteView(SuperUserRequiredMixin, View):
         return redirect('admin_dashboard:categories')
 
 
-class AdminMembersView(SuperUserRequiredMixin, ListView):
+class AdminMembersView(SuperUserRequiredMixin, KeysetPaginationMixin, ListView):
     model = User
     template_name = "dashboard/admin/members.html"
     context_object_name = "members"
     paginate_by = 10
+    keyset_ordering = ["-date_joined", "-id"]
 
     def get_queryset(self):
-        return User.objects.select_related("country").order_by("-date_joined")
+        return User.objects.select_related("country")
 
 
 class AdminMemberToggleView(SuperUserRequiredMixin, View):
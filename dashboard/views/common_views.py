@@ -2,13 +2,11 @@ from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.generic import ListView, View
-from django.db.models import Sum, Count
-from django.db.models.functions import TruncDay
-from django.utils import timezone
-from datetime import timedelta
+from django.db.models import Sum
 from django.shortcuts import render
 
-from campaign.models import Campaign, Donation
+from campaign.models import Campaign, Donation, DonorDailyStat, OwnerDailyStat
+from dashboard.charts import CHART_BUCKETS, CHART_RANGES, chart_options, daily_stat_chart
 
 
 class DashboardView(View):
@@ -19,85 +17,45 @@ class DashboardView(View):
         return super().dispatch(self.request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
-        # Get date 30 days ago
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        # Get user campaigns
-        user_campaigns = Campaign.objects.filter(user=self.request.user)
-        
-        # Get daily donations RECEIVED on user's campaigns for last 30 days
-        daily_donations = Donation.objects.filter(
-            campaign__user=self.request.user,
-            date__gte=thirty_days_ago
-        ).annotate(
-            day=TruncDay('date')
-        ).values('day').annotate(
-            total=Sum('donation'),
-            count=Count('id')
-        ).order_by('day')
-
-        # Get daily donations GIVEN by the user (by email) for last 30 days
-        daily_given = Donation.objects.filter(
-            email=self.request.user.email,
-            date__gte=thirty_days_ago
-        ).annotate(
-            day=TruncDay('date')
-        ).values('day').annotate(
-            total=Sum('donation'),
-            count=Count('id')
-        ).order_by('day')
-        
-        # Prepare chart data
-        dates = []
-        amounts = []
-        counts = []
-        
-        current_date = thirty_days_ago.date()
-        end_date = timezone.now().date()
-        
-        # Create lookup dictionary
-        donations_dict = {
-            d['day'].strftime('%Y-%m-%d'): {'total': d['total'], 'count': d['count']}
-            for d in daily_donations
-        }
-        given_dict = {
-            d['day'].strftime('%Y-%m-%d'): {'total': d['total'], 'count': d['count']}
-            for d in daily_given
-        }
-
-        while current_date <= end_date:
-            dates.append(current_date.strftime('%Y-%m-%d'))
-            current_datetime = timezone.make_aware(
-                timezone.datetime.combine(current_date, timezone.datetime.min.time())
-            )
-            key = current_datetime.strftime('%Y-%m-%d')
-            day_data = donations_dict.get(key, {'total': 0, 'count': 0})
-            given_data = given_dict.get(key, {'total': 0, 'count': 0})
-            amounts.append(float(given_data['total'] or 0))
-            counts.append(given_data['count'])
-            current_date += timedelta(days=1)
+        user = self.request.user
+
+        # Daily donations GIVEN by the user (by email), read from the rollups
+        chart_range, chart_bucket = chart_options(self.request)
+        dates, amounts, counts = daily_stat_chart(
+            DonorDailyStat.objects.filter(email=user.email),
+            chart_range,
+            chart_bucket,
+            amount="amount",
+            count="count",
+        )
+        received = OwnerDailyStat.objects.filter(owner=user).aggregate(total=Sum("amount"))
+        given = DonorDailyStat.objects.filter(email=user.email).aggregate(
+            total=Sum("amount"), count=Sum("count")
+        )
 
         # Get campaigns the user has donated to
         donated_campaigns = Campaign.objects.filter(
             donation__email=self.request.user.email
-        ).distinct().select_related('user').prefetch_related(
-            'donation_set'
-        ).order_by('-donation__date', '-donation__id')[:6]
+        ).distinct().select_related('user').order_by(
+            '-donation__date', '-donation__id'
+        )[:6]
 
         context = {
             # Total raised on user's campaigns (received)
-            "total_raised": Donation.objects.filter(
-                campaign__user=self.request.user
-            ).aggregate(Sum("donation"))["donation__sum"] or 0,
+            "total_raised": received["total"] or 0,
             # My donations given (by email)
-            "my_given_total": Donation.objects.filter(email=self.request.user.email).aggregate(Sum("donation"))["donation__sum"] or 0,
-            "my_given_count": Donation.objects.filter(email=self.request.user.email).count(),
+            "my_given_total": given["total"] or 0,
+            "my_given_count": given["count"] or 0,
             # Campaigns the user has donated to
             "donated_campaigns": donated_campaigns,
             # Keep original dates but chart now shows given amounts
             "chart_dates": dates,
             "chart_amounts": amounts,
             "chart_counts": counts,
+            "chart_range": chart_range,
+            "chart_bucket": chart_bucket,
+            "chart_ranges": CHART_RANGES,
+            "chart_buckets": CHART_BUCKETS,
         }
         return context
 
@@ -117,7 +75,7 @@ class CampaignListView(ListView):
     def get_queryset(self):
         return (
             Campaign.objects.filter(user=self.request.user)
-            .prefetch_related("donation_set")
+            .with_stats()
             .order_by("-date")
         )
 
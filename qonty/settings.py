@@ -4,7 +4,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 SECRET_KEY = '%g0w^#k4h6@au72654i++-jd&-7p@+(rikbnv227eoe+_(#h%*'
 
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "true").lower() == "true"
 
 ALLOWED_HOSTS = list(filter(None, os.getenv("ALLOWED_HOSTS", "*,bettertogetherapp-production.up.railway.app").split(",")))
 
@@ -33,16 +33,18 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'django.contrib.staticfiles',
+    # collectstatic leaves out unused vendor files
+    'core.staticfiles.StaticFilesConfig',
     'django.contrib.humanize',
-    'debug_toolbar',
     'accounts',
     'core',
     'campaign',
     'dashboard',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -50,9 +52,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'campaign.loaders.CampaignStatsLoaderMiddleware',
+    'core.db_router.ReplicaMiddleware',
 ]
 
+# The toolbar instruments every request; keep it out of production workers.
+DEBUG_TOOLBAR = os.getenv("DEBUG_TOOLBAR", str(DEBUG)).lower() == "true"
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'qonty.urls'
 
 TEMPLATES = [
@@ -77,10 +86,66 @@ WSGI_APPLICATION = 'qonty.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'qonty.sqlite3'),
+        'NAME': os.getenv('SQLITE_PATH', os.path.join(BASE_DIR, 'qonty.sqlite3')),
+    }
+}
+
+# Read replicas (core.db_router): comma-separated SQLite files kept current
+# with the primary, e.g. by `manage.py sync_sqlite_replicas` when testing
+# locally. Without any, every query goes to the primary.
+DATABASE_REPLICAS = []
+for number, path in enumerate(filter(None, os.getenv('SQLITE_REPLICA_PATHS', '').split(',')), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# URL names whose GET requests read from the replicas: the heavy, read-only
+# dashboards, admin lists and search.
+DATABASE_REPLICA_VIEWS = [
+    'campaign:campaign-list',
+    'dashboard:home',
+    'dashboard:campaigns',
+    'dashboard:donations',
+    'admin_dashboard:home',
+    'admin_dashboard:campaigns',
+    'admin_dashboard:donations',
+    'admin_dashboard:categories',
+    'admin_dashboard:members',
+]
+
+# How long a client that wrote keeps reading from the primary; longer than
+# the replication lag.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+# Shared by every worker in production (e.g. FileBasedCache on a common
+# directory or a Redis/Memcached backend; docker-compose.prod.yml runs Redis)
+# so version bumps invalidate cached data everywhere.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+# Unhandled request errors go to stderr in every environment (Django's
+# default only logs them with DEBUG on), so worker logs keep the tracebacks.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'django.request': {'handlers': ['console'], 'level': 'ERROR', 'propagate': False},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -113,6 +178,22 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# collectstatic writes content-hashed, precompressed files and a manifest that
+# {% static %} reads. The manifest only exists once collectstatic has run, so
+# development and tests keep the plain storage.
+STATIC_MANIFEST = os.getenv("STATIC_MANIFEST", str(not DEBUG)).lower() == "true"
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'core.staticfiles.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 AUTH_USER_MODEL = "accounts.User"
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -122,4 +203,12 @@ INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+# Per-view request metrics (core.metrics). Each worker writes its totals to
+# METRICS_DIR so /metrics reports the whole deployment; leave it empty to
+# report the answering process only.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = 5
+# Addresses or networks allowed to read /metrics.
+METRICS_ALLOWED_IPS = INTERNAL_IPS + list(filter(None, os.getenv("METRICS_ALLOWED_IPS", "::1").split(",")))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'